@@ -1,13 +1,18 @@
 import os
 import logging
+import sqlite3
 from flask import Flask
+from flask_caching import Cache
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 
 # Configure logging
 log_level = os.environ.get('LOG_LEVEL', 'INFO')
 logging.basicConfig(level=getattr(logging, log_level.upper()))
 
 db = SQLAlchemy()
+cache = Cache()
 
 # Create the app
 app = Flask(__name__)
@@ -24,9 +29,35 @@ app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
     "pool_recycle": 300,
     "pool_pre_ping": True,
 }
+if not database_url.startswith("sqlite"):
+    # Size the pool for many concurrent gevent requests per worker; LIFO keeps
+    # the most recently used (warm) connections in rotation
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"].update({
+        "pool_size": int(os.environ.get("DB_POOL_SIZE", 20)),
+        "max_overflow": int(os.environ.get("DB_MAX_OVERFLOW", 40)),
+        "pool_use_lifo": True,
+    })
 
-# Initialize the app with the extension
+@event.listens_for(Engine, "connect")
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Let SQLite readers proceed while an upload is writing"""
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.execute("PRAGMA cache_size=-64000")
+    cursor.close()
+
+# Configure response caching (per-process by default; set CACHE_TYPE=RedisCache and CACHE_REDIS_URL to share)
+app.config["CACHE_TYPE"] = os.environ.get("CACHE_TYPE", "SimpleCache")
+app.config["CACHE_REDIS_URL"] = os.environ.get("CACHE_REDIS_URL")
+app.config["CACHE_DEFAULT_TIMEOUT"] = 3600
+
+# Initialize the app with the extensions
 db.init_app(app)
+cache.init_app(app)
 
 with app.app_context():
     # Import models to ensure tables are created
@@ -34,3 +65,45 @@ with app.app_context():
     # Import routes after models are registered
     from routes import *
     db.create_all()
+
+
+# Rows backfilled per flush when mirroring stored statistics into typed columns
+BACKFILL_BATCH_SIZE = 500
+
+@app.cli.command('upgrade-db')
+def upgrade_db():
+    """Add columns and indexes introduced since the tables were created, then backfill them"""
+    # Runs once per deploy (see render.yaml and .replit) rather than at import,
+    # so gunicorn workers booting together never race on the same ALTER TABLE.
+    # Only columns the inspector reports missing are added, which keeps reruns
+    # a no-op on every database backend.
+    experiments_table = models.Experiment.__table__
+    existing_columns = {column['name'] for column in db.inspect(db.engine).get_columns(experiments_table.name)}
+    missing_columns = [column for column in experiments_table.columns if column.name not in existing_columns]
+    with db.engine.begin() as connection:
+        for column in missing_columns:
+            column_type = column.type.compile(dialect=db.engine.dialect)
+            connection.execute(db.text(f'ALTER TABLE {experiments_table.name} ADD COLUMN {column.name} {column_type}'))
+    for index in experiments_table.indexes:
+        index.create(bind=db.engine, checkfirst=True)
+    
+    # Backfill typed metric columns for experiments stored before they existed,
+    # a batch at a time in id order, so memory and transactions stay bounded
+    needs_backfill = (models.Experiment.statistics.isnot(None), models.Experiment.sensitivity.is_(None))
+    backfilled = 0
+    last_id = 0
+    while True:
+        batch = db.session.scalars(
+            db.select(models.Experiment)
+            .where(*needs_backfill, models.Experiment.id > last_id)
+            .order_by(models.Experiment.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not batch:
+            break
+        for experiment in batch:
+            experiment.set_statistics(experiment.get_statistics())
+        last_id = batch[-1].id
+        backfilled += len(batch)
+        db.session.commit()
+    logging.info(f"Backfilled typed statistics for {backfilled} experiments")
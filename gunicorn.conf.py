@@ -0,0 +1,23 @@
+import os
+
+# Gunicorn loads this file automatically from the working directory.
+# Most routes wait on the database or on file I/O, so cooperative gevent
+# workers let each process serve many requests at once. The gevent worker
+# monkey-patches the standard library itself before loading the app.
+# CPU-bound work (report rendering, upload validation) is handed to the
+# hub's thread pool by routes._run_cpu_bound so it does not stall the hub.
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gevent')
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 1000))
+
+
+def post_worker_init(worker):
+    """Make psycopg2 yield to the gevent hub instead of blocking the worker"""
+    if worker_class != 'gevent':
+        return
+    try:
+        from psycogreen.gevent import patch_psycopg
+    except ImportError:
+        worker.log.warning("psycogreen unavailable; PostgreSQL queries will block gevent workers")
+        return
+    patch_psycopg()
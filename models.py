@@ -2,14 +2,43 @@ from app import db
 from datetime import datetime
 import json
 
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib decoder
+    orjson = None
+
+
+def _json_loads(text):
+    """Decode a stored blob that never holds non-finite floats, using orjson when available"""
+    # orjson rejects the Infinity/NaN tokens that json.dumps writes for
+    # unbounded likelihood ratios, so statistics blobs keep using json.loads
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _json_dumps(obj):
+    """Encode a payload that never holds non-finite floats, using orjson when available"""
+    # orjson writes inf/NaN as null, so statistics blobs keep using json.dumps
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+
 class Experiment(db.Model):
     """Model for storing experimental data and results"""
     __tablename__ = 'experiments'
+    __table_args__ = (
+        # Serves technique grouping ordered by date; the technique prefix also covers plain technique filters
+        db.Index('ix_exp_tech_created', 'technique', 'created_at'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text)
     technique = db.Column(db.String(50), nullable=False)  # qPCR, RPA, LAMP, NASBA
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     
     # Confusion matrix data
     true_positive = db.Column(db.Integer, nullable=False)
@@ -20,6 +49,24 @@ class Experiment(db.Model):
     # Calculated statistics (stored as JSON)
     statistics = db.Column(db.Text)  # JSON string
     
+    # Headline metrics mirrored from statistics as typed columns, so listings
+    # can read, filter and sort on them without loading the JSON blob
+    sensitivity = db.Column(db.Float)
+    sensitivity_ci_lower = db.Column(db.Float)
+    sensitivity_ci_upper = db.Column(db.Float)
+    specificity = db.Column(db.Float)
+    specificity_ci_lower = db.Column(db.Float)
+    specificity_ci_upper = db.Column(db.Float)
+    ppv = db.Column(db.Float)
+    ppv_ci_lower = db.Column(db.Float)
+    ppv_ci_upper = db.Column(db.Float)
+    npv = db.Column(db.Float)
+    npv_ci_lower = db.Column(db.Float)
+    npv_ci_upper = db.Column(db.Float)
+    accuracy = db.Column(db.Float)
+    accuracy_ci_lower = db.Column(db.Float)
+    accuracy_ci_upper = db.Column(db.Float)
+    
     # Analysis settings
     confidence_level = db.Column(db.Float, default=0.95)
     
@@ -43,9 +90,17 @@ class Experiment(db.Model):
         self.equipment_cost = equipment_cost
         self.total_cost = total_cost
     
+    # Metrics mirrored into typed columns by set_statistics
+    TYPED_METRICS = ('sensitivity', 'specificity', 'ppv', 'npv', 'accuracy')
+    
     def set_statistics(self, stats_dict):
-        """Store statistics as JSON string"""
+        """Store statistics as JSON string and mirror headline metrics into typed columns"""
         self.statistics = json.dumps(stats_dict)
+        for metric in self.TYPED_METRICS:
+            values = stats_dict.get(metric, {})
+            setattr(self, metric, values.get('value'))
+            setattr(self, f'{metric}_ci_lower', values.get('ci_lower'))
+            setattr(self, f'{metric}_ci_upper', values.get('ci_upper'))
     
     def get_statistics(self):
         """Retrieve statistics as dictionary"""
@@ -55,11 +110,38 @@ class Experiment(db.Model):
     
     def get_confusion_matrix(self):
         """Return confusion matrix as 2x2 numpy array"""
-        import numpy as np
-        return np.array([
-            [self.true_positive, self.false_positive],
-            [self.false_negative, self.true_negative]
-        ])
+        return np.array(
+            ((self.true_positive, self.false_positive),
+             (self.false_negative, self.true_negative)),
+            dtype=np.int64
+        )
+
+    @classmethod
+    def stack_confusion_matrices(cls, experiments):
+        """Return the confusion matrices of many experiments as one (n, 2, 2) array
+        
+        Args:
+            experiments: Sequence of Experiment instances
+            
+        Returns:
+            int64 array where entry i is experiments[i].get_confusion_matrix()
+        """
+        flat = np.fromiter(
+            (count
+             for experiment in experiments
+             for count in (experiment.true_positive, experiment.false_positive,
+                           experiment.false_negative, experiment.true_negative)),
+            dtype=np.int64,
+            count=4 * len(experiments)
+        )
+        return flat.reshape(-1, 2, 2)
+
+# Association table linking comparison studies to the experiments they compare
+comparison_experiments = db.Table(
+    'comparison_experiments',
+    db.Column('comparison_id', db.Integer, db.ForeignKey('comparison_studies.id'), primary_key=True),
+    db.Column('experiment_id', db.Integer, db.ForeignKey('experiments.id'), primary_key=True)
+)
 
 class ComparisonStudy(db.Model):
     """Model for storing comparison studies between multiple techniques"""
@@ -71,6 +153,8 @@ class ComparisonStudy(db.Model):
     
     # Reference to experiments being compared
     experiment_ids = db.Column(db.Text)  # JSON array of experiment IDs
+    # Eagerly loaded with a single IN query whenever studies are loaded
+    experiments = db.relationship('Experiment', secondary=comparison_experiments, lazy='selectin')
     
     # Cohen's Kappa results
     kappa_results = db.Column(db.Text)  # JSON string
@@ -82,20 +166,20 @@ class ComparisonStudy(db.Model):
     
     def set_experiment_ids(self, ids_list):
         """Store experiment IDs as JSON string"""
-        self.experiment_ids = json.dumps(ids_list)
+        self.experiment_ids = _json_dumps(ids_list)
     
     def get_experiment_ids(self):
         """Retrieve experiment IDs as list"""
         if self.experiment_ids:
-            return json.loads(self.experiment_ids)
+            return _json_loads(self.experiment_ids)
         return []
     
     def set_kappa_results(self, kappa_dict):
         """Store kappa results as JSON string"""
-        self.kappa_results = json.dumps(kappa_dict)
+        self.kappa_results = _json_dumps(kappa_dict)
     
     def get_kappa_results(self):
         """Retrieve kappa results as dictionary"""
         if self.kappa_results:
-            return json.loads(self.kappa_results)
+            return _json_loads(self.kappa_results)
         return {}
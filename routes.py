@@ -1,18 +1,47 @@
-from flask import render_template, request, jsonify, redirect, url_for, flash, send_file
-from app import app, db
+from flask import render_template, request, jsonify, redirect, url_for, flash, send_file, abort
+from app import app, db, cache
 from models import Experiment, ComparisonStudy
-from utils.statistics import calculate_diagnostic_stats, calculate_cohens_kappa
-from utils.cost_analysis import get_technique_costs, calculate_total_cost
+from utils.statistics import calculate_diagnostic_stats_batch, calculate_pairwise_kappa_from_counts
+from utils.cost_analysis import get_technique_costs
+from utils.analysis import analyze
 from utils.file_processing import process_uploaded_file
 from utils.report_generation import generate_pdf_report, generate_excel_report
+from sqlalchemy import func
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import load_only, defer
+from itertools import groupby
+from operator import attrgetter
 import json
 import io
 import logging
+import tempfile
+
+try:
+    from gevent import get_hub, monkey
+except ImportError:  # gevent is optional; without it CPU-bound work simply runs inline
+    monkey = None
+
+# Techniques offered on the cost comparison page, in display order
+SUPPORTED_TECHNIQUES = ('PCR', 'qPCR', 'LAMP', 'RPA', 'NASBA', 'TMA', 'HDA', 'SDA', 'NEAR')
+
+# Static per-technique cost table shown on the cost comparison page
+TECHNIQUE_COST_DATA = {technique: get_technique_costs(technique) for technique in SUPPORTED_TECHNIQUES}
+
+# Most recent experiments listed per technique on the cost comparison page
+COST_COMPARISON_ROWS_PER_TECHNIQUE = 50
+
+# Reports larger than this are spooled to a temporary file while being streamed out
+EXPORT_SPOOL_MAX_BYTES = 1024 * 1024
 
 @app.route('/')
 def index():
     """Home page with overview of the application"""
-    recent_experiments = Experiment.query.order_by(Experiment.created_at.desc()).limit(5).all()
+    # The overview table never touches the statistics JSON blob
+    recent_experiments = Experiment.query.options(
+        load_only(Experiment.id, Experiment.name, Experiment.description, Experiment.technique,
+                  Experiment.created_at, Experiment.true_positive, Experiment.false_positive,
+                  Experiment.true_negative, Experiment.false_negative, Experiment.total_cost)
+    ).order_by(Experiment.created_at.desc()).limit(5).all()
     return render_template('index.html', recent_experiments=recent_experiments)
 
 @app.route('/data_input')
@@ -45,12 +74,8 @@ def submit_experiment():
             flash('At least one confusion matrix value must be greater than 0', 'error')
             return redirect(url_for('data_input'))
         
-        # Calculate diagnostic statistics
-        stats = calculate_diagnostic_stats(tp, fp, tn, fn, confidence_level)
-        
-        # Get cost analysis
-        cost_data = get_technique_costs(technique)
-        total_cost = calculate_total_cost(technique, tp + fp + tn + fn)
+        # Calculate diagnostic statistics and cost analysis
+        result = analyze(technique, tp, fp, tn, fn, confidence_level)
         
         # Create experiment record
         experiment = Experiment(
@@ -62,12 +87,12 @@ def submit_experiment():
             true_negative=tn,
             false_negative=fn,
             confidence_level=confidence_level,
-            reagent_cost=cost_data['reagent_cost_per_test'],
-            equipment_cost=cost_data['equipment_cost'],
-            total_cost=total_cost
+            reagent_cost=result.cost_data['reagent_cost_per_test'],
+            equipment_cost=result.cost_data['equipment_cost'],
+            total_cost=result.total_cost
         )
         
-        experiment.set_statistics(stats)
+        experiment.set_statistics(result.statistics)
         
         db.session.add(experiment)
         db.session.commit()
@@ -76,6 +101,7 @@ def submit_experiment():
         return redirect(url_for('view_experiment', id=experiment.id))
         
     except Exception as e:
+        db.session.rollback()
         logging.error(f"Error submitting experiment: {str(e)}")
         flash('Error processing experiment data', 'error')
         return redirect(url_for('data_input'))
@@ -94,60 +120,74 @@ def upload_file():
             return redirect(url_for('data_input'))
         
         # Process the uploaded file
-        experiments_data = process_uploaded_file(file)
+        experiments_data = _run_cpu_bound(process_uploaded_file, file)
         
         if not experiments_data:
             flash('No valid data found in file', 'error')
             return redirect(url_for('data_input'))
         
-        # Create experiments from file data
-        created_count = 0
-        for exp_data in experiments_data:
-            try:
-                stats = calculate_diagnostic_stats(
-                    exp_data['tp'], exp_data['fp'], 
-                    exp_data['tn'], exp_data['fn']
-                )
-                
-                cost_data = get_technique_costs(exp_data['technique'])
-                total_samples = exp_data['tp'] + exp_data['fp'] + exp_data['tn'] + exp_data['fn']
-                total_cost = calculate_total_cost(exp_data['technique'], total_samples)
-                
-                experiment = Experiment(
-                    name=exp_data['name'],
-                    description=exp_data.get('description', ''),
-                    technique=exp_data['technique'],
-                    true_positive=exp_data['tp'],
-                    false_positive=exp_data['fp'],
-                    true_negative=exp_data['tn'],
-                    false_negative=exp_data['fn'],
-                    reagent_cost=cost_data['reagent_cost_per_test'],
-                    equipment_cost=cost_data['equipment_cost'],
-                    total_cost=total_cost
-                )
-                
-                experiment.set_statistics(stats)
-                db.session.add(experiment)
-                created_count += 1
-                
-            except Exception as e:
-                logging.error(f"Error creating experiment from file data: {str(e)}")
-                continue
+        # Statistics and cost analysis for every row run off the hub as well
+        experiments = _run_cpu_bound(_build_uploaded_experiments, experiments_data)
+        
+        # Insert all rows in one batch, bypassing per-object unit-of-work bookkeeping
+        try:
+            db.session.bulk_save_objects(experiments)
+            db.session.commit()
+            created_count = len(experiments)
+        except SQLAlchemyError as e:
+            # Retry with one savepoint per row so a single bad row is rolled back
+            # cleanly instead of aborting the whole upload
+            db.session.rollback()
+            logging.warning(f"Bulk insert failed, retrying row by row: {str(e)}")
+            created_count = 0
+            for experiment in experiments:
+                try:
+                    with db.session.begin_nested():
+                        db.session.add(experiment)
+                    created_count += 1
+                except SQLAlchemyError as e:
+                    logging.error(f"Error saving experiment from file data: {str(e)}")
+            db.session.commit()
         
-        db.session.commit()
         flash(f'Successfully created {created_count} experiments from file', 'success')
         return redirect(url_for('analysis'))
         
     except Exception as e:
+        db.session.rollback()
         logging.error(f"Error processing file upload: {str(e)}")
         flash('Error processing uploaded file', 'error')
         return redirect(url_for('data_input'))
 
+def _experiment_version(id):
+    """
+    Identify the current row behind an experiment id, for keying cached copies of it
+    
+    Rows are immutable after submission, but a deleted row's id can be reused;
+    the creation timestamp tells the two apart. Only the indexed created_at
+    column is read, so this is a cheap primary-key lookup.
+    """
+    created_at = db.session.scalar(db.select(Experiment.created_at).where(Experiment.id == id))
+    if created_at is None:
+        abort(404)
+    return f'{id}-{created_at.timestamp()}'
+
+def _experiment_snapshot(id):
+    """Load an experiment and its decoded statistics, memoized per row version"""
+    # Keyed on the row version so a reused id or a deleted row never serves a stale copy
+    cache_key = f'experiment-snapshot-{_experiment_version(id)}'
+    snapshot = cache.get(cache_key)
+    if snapshot is None:
+        experiment = Experiment.query.get_or_404(id)
+        # Detach so the cached copy never triggers lazy loads against a closed session
+        db.session.expunge(experiment)
+        snapshot = (experiment, experiment.get_statistics())
+        cache.set(cache_key, snapshot)
+    return snapshot
+
 @app.route('/experiment/<int:id>')
 def view_experiment(id):
     """View individual experiment results"""
-    experiment = Experiment.query.get_or_404(id)
-    stats = experiment.get_statistics()
+    experiment, stats = _experiment_snapshot(id)
     cost_data = get_technique_costs(experiment.technique)
     
     return render_template('results.html', 
@@ -189,46 +229,17 @@ def compare_techniques():
             flash('Selected experiments not found', 'error')
             return redirect(url_for('analysis'))
         
-        # Calculate Cohen's Kappa for pairwise comparisons
+        # Calculate Cohen's Kappa for all pairwise comparisons at once
+        counts = Experiment.stack_confusion_matrices(experiments).reshape(-1, 4)
         kappa_results = {}
-        for i, exp1 in enumerate(experiments):
-            for j, exp2 in enumerate(experiments[i+1:], i+1):
-                # Create binary classification arrays for comparison
-                # For simplicity, we'll use positive/negative classification
-                rater1 = []
-                rater2 = []
-                
-                # Create arrays based on confusion matrix proportions
-                total1 = exp1.true_positive + exp1.false_positive + exp1.true_negative + exp1.false_negative
-                total2 = exp2.true_positive + exp2.false_positive + exp2.true_negative + exp2.false_negative
-                
-                # Normalize to smaller sample size for comparison
-                min_total = min(total1, total2)
-                
-                # Create proportional arrays
-                for _ in range(int((exp1.true_positive / total1) * min_total)):
-                    rater1.append(1)
-                    rater2.append(1)
-                for _ in range(int((exp1.false_positive / total1) * min_total)):
-                    rater1.append(1)
-                    rater2.append(0)
-                for _ in range(int((exp1.false_negative / total1) * min_total)):
-                    rater1.append(0)
-                    rater2.append(1)
-                for _ in range(int((exp1.true_negative / total1) * min_total)):
-                    rater1.append(0)
-                    rater2.append(0)
-                
-                # Calculate Cohen's Kappa
-                kappa_result = calculate_cohens_kappa(rater1, rater2)
-                
-                comparison_key = f"{exp1.name} vs {exp2.name}"
-                kappa_results[comparison_key] = {
-                    'kappa': kappa_result['kappa'],
-                    'confidence_interval': kappa_result['confidence_interval'],
-                    'standard_error': kappa_result['standard_error'],
-                    'interpretation': kappa_result['interpretation']
-                }
+        for i, j, kappa_result in calculate_pairwise_kappa_from_counts(counts):
+            comparison_key = f"{experiments[i].name} vs {experiments[j].name}"
+            kappa_results[comparison_key] = {
+                'kappa': kappa_result['kappa'],
+                'confidence_interval': kappa_result['confidence_interval'],
+                'standard_error': kappa_result['standard_error'],
+                'interpretation': kappa_result['interpretation']
+            }
         
         # Create comparison study record
         comparison = ComparisonStudy(
@@ -236,6 +247,7 @@ def compare_techniques():
             f"Comparison of {len(experiments)} techniques"
         )
         comparison.set_experiment_ids([int(id) for id in experiment_ids])
+        comparison.experiments = experiments
         comparison.set_kappa_results(kappa_results)
         
         db.session.add(comparison)
@@ -254,40 +266,136 @@ def compare_techniques():
 @app.route('/cost_comparison')
 def cost_comparison():
     """Cost comparison analysis page"""
-    techniques = ['PCR', 'qPCR', 'LAMP', 'RPA', 'NASBA', 'TMA', 'HDA', 'SDA', 'NEAR']
-    cost_data = {}
+    cost_data = TECHNIQUE_COST_DATA
     
-    for technique in techniques:
-        cost_data[technique] = get_technique_costs(technique)
+    # Count experiments per technique in SQL rather than fetching every row
+    technique_counts = dict(
+        db.session.query(Experiment.technique, func.count(Experiment.id))
+        .group_by(Experiment.technique)
+        .all()
+    )
     
-    # Get experiments grouped by technique for real cost analysis
-    experiments = Experiment.query.all()
-    technique_experiments = {}
-    for exp in experiments:
-        if exp.technique not in technique_experiments:
-            technique_experiments[exp.technique] = []
-        technique_experiments[exp.technique].append(exp)
+    # Fetch only the newest rows per technique for the real cost analysis tables
+    row_number = func.row_number().over(
+        partition_by=Experiment.technique,
+        order_by=Experiment.created_at.desc()
+    ).label('row_number')
+    ranked = db.session.query(Experiment.id, row_number).subquery()
+    
+    # Sorting by (technique, created_at) in SQL follows ix_exp_tech_created,
+    # so rows arrive already bucketed and only need to be split
+    experiments = Experiment.query.options(
+        defer(Experiment.description), defer(Experiment.statistics)
+    ).join(
+        ranked, Experiment.id == ranked.c.id
+    ).filter(
+        ranked.c.row_number <= COST_COMPARISON_ROWS_PER_TECHNIQUE
+    ).order_by(
+        Experiment.technique, Experiment.created_at.desc()
+    ).all()
+    technique_experiments = {
+        technique: list(group)
+        for technique, group in groupby(experiments, key=attrgetter('technique'))
+    }
     
     return render_template('cost_comparison.html', 
                          cost_data=cost_data,
-                         technique_experiments=technique_experiments)
+                         technique_experiments=technique_experiments,
+                         technique_counts=technique_counts)
+
+def _run_cpu_bound(func, *args):
+    """
+    Run CPU-heavy work (report rendering, upload parsing and analysis) off the gevent hub
+    
+    Under the gevent worker a long computation in a greenlet stalls every other
+    request of the process, so it runs in the hub's native thread pool instead
+    and only the calling greenlet waits. Elsewhere the call runs inline.
+    """
+    if monkey is not None and monkey.is_module_patched('threading'):
+        return get_hub().threadpool.apply(func, args)
+    return func(*args)
+
+def _build_uploaded_experiments(experiments_data):
+    """
+    Build unsaved Experiment rows, with statistics and costs, from parsed upload data
+    
+    Args:
+        experiments_data: Rows returned by process_uploaded_file
+    
+    Returns:
+        list: Experiment objects for the rows that could be analysed
+    """
+    # Calculate diagnostic statistics for every row in one vectorized pass
+    batch_stats = calculate_diagnostic_stats_batch(
+        [exp_data['tp'] for exp_data in experiments_data],
+        [exp_data['fp'] for exp_data in experiments_data],
+        [exp_data['tn'] for exp_data in experiments_data],
+        [exp_data['fn'] for exp_data in experiments_data]
+    )
+    
+    experiments = []
+    for exp_data, stats in zip(experiments_data, batch_stats):
+        try:
+            result = analyze(
+                exp_data['technique'],
+                exp_data['tp'], exp_data['fp'],
+                exp_data['tn'], exp_data['fn'],
+                statistics=stats
+            )
+            
+            experiment = Experiment(
+                name=exp_data['name'],
+                description=exp_data.get('description', ''),
+                technique=exp_data['technique'],
+                true_positive=exp_data['tp'],
+                false_positive=exp_data['fp'],
+                true_negative=exp_data['tn'],
+                false_negative=exp_data['fn'],
+                reagent_cost=result.cost_data['reagent_cost_per_test'],
+                equipment_cost=result.cost_data['equipment_cost'],
+                total_cost=result.total_cost
+            )
+            
+            experiment.set_statistics(result.statistics)
+            experiments.append(experiment)
+            
+        except Exception as e:
+            logging.error(f"Error creating experiment from file data: {str(e)}")
+            continue
+    
+    return experiments
+
+def _export_spool():
+    """Report sink that stays in memory for typical reports and spills large ones to disk"""
+    return tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_MAX_BYTES)
+
+def _pdf_report_bytes(experiment, stats):
+    """Render an experiment's PDF report, memoized since rows are immutable after submission"""
+    # experiment comes from _experiment_snapshot, which already resolved the row
+    # version; a cached report keeps the generation time printed in its footer
+    cache_key = f'experiment-pdf-{experiment.id}-{experiment.created_at.timestamp()}'
+    pdf_bytes = cache.get(cache_key)
+    if pdf_bytes is None:
+        pdf_bytes = _run_cpu_bound(generate_pdf_report, experiment, io.BytesIO(), stats).getvalue()
+        cache.set(cache_key, pdf_bytes)
+    return pdf_bytes
 
 @app.route('/export/<format>/<int:experiment_id>')
 def export_results(format, experiment_id):
     """Export experiment results to PDF or Excel"""
     try:
-        experiment = Experiment.query.get_or_404(experiment_id)
+        experiment, stats = _experiment_snapshot(experiment_id)
         
         if format == 'pdf':
-            pdf_buffer = generate_pdf_report(experiment)
+            # A fresh stream per response; the cached bytes are never handed out directly
             return send_file(
-                pdf_buffer,
+                io.BytesIO(_pdf_report_bytes(experiment, stats)),
                 as_attachment=True,
                 download_name=f"{experiment.name}_report.pdf",
                 mimetype='application/pdf'
             )
         elif format == 'excel':
-            excel_buffer = generate_excel_report(experiment)
+            excel_buffer = _run_cpu_bound(generate_excel_report, experiment, _export_spool(), stats)
             return send_file(
                 excel_buffer,
                 as_attachment=True,
@@ -306,29 +414,47 @@ def export_results(format, experiment_id):
 @app.route('/api/experiment/<int:id>/data')
 def get_experiment_data(id):
     """API endpoint to get experiment data for charts"""
-    experiment = Experiment.query.get_or_404(id)
-    stats = experiment.get_statistics()
-    
-    return jsonify({
-        'name': experiment.name,
-        'technique': experiment.technique,
-        'confusion_matrix': {
-            'tp': experiment.true_positive,
-            'fp': experiment.false_positive,
-            'tn': experiment.true_negative,
-            'fn': experiment.false_negative
-        },
-        'statistics': stats,
-        'costs': {
-            'reagent_cost': experiment.reagent_cost,
-            'equipment_cost': experiment.equipment_cost,
-            'total_cost': experiment.total_cost
+    # Experiments are never modified after submission, so the payload can be
+    # cached and browsers can revalidate against a stable ETag
+    version = _experiment_version(id)
+    cache_key = f'experiment-data-{version}'
+    cached = cache.get(cache_key)
+    if cached is None:
+        experiment = Experiment.query.get_or_404(id)
+        stats = experiment.get_statistics()
+        
+        payload = {
+            'name': experiment.name,
+            'technique': experiment.technique,
+            'confusion_matrix': {
+                'tp': experiment.true_positive,
+                'fp': experiment.false_positive,
+                'tn': experiment.true_negative,
+                'fn': experiment.false_negative
+            },
+            'statistics': stats,
+            'costs': {
+                'reagent_cost': experiment.reagent_cost,
+                'equipment_cost': experiment.equipment_cost,
+                'total_cost': experiment.total_cost
+            }
         }
-    })
+        cached = (version, payload)
+        cache.set(cache_key, cached)
+    
+    etag, payload = cached
+    response = jsonify(payload)
+    response.set_etag(etag)
+    return response.make_conditional(request)
+
+@app.route('/favicon.ico')
+def favicon():
+    """No favicon is shipped; answer browser probes without rendering the 404 page"""
+    return '', 204
 
 @app.errorhandler(404)
 def not_found(error):
-    return render_template('index.html'), 404
+    return render_template('404.html'), 404
 
 @app.errorhandler(500)
 def internal_error(error):
@@ -0,0 +1,5 @@
+import os
+import tempfile
+
+# Importing the app creates its tables; keep them out of the instance folder
+os.environ.setdefault('DATABASE_URL', 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'test.db'))
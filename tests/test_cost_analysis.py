@@ -0,0 +1,20 @@
+import pytest
+
+from utils.cost_analysis import compare_technique_costs, generate_cost_summary
+
+
+def test_cost_summary_recommends_cheapest_technique():
+    summary = generate_cost_summary(['qPCR', 'LAMP'], [100])
+
+    comparison = compare_technique_costs(['qPCR', 'LAMP'], 100)
+    recommendation = summary['recommendations']['100_samples']
+    assert summary['scenarios']['100_samples'] == comparison
+    assert recommendation['most_cost_effective'] == 'LAMP'
+    assert recommendation['cost_savings_vs_most_expensive'] == pytest.approx(
+        comparison['qPCR']['total_cost'] - comparison['LAMP']['total_cost']
+    )
+
+
+def test_cost_summary_without_known_techniques_raises():
+    with pytest.raises(ValueError):
+        generate_cost_summary(['not-a-technique'], [100])
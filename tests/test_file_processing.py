@@ -0,0 +1,47 @@
+import io
+
+from werkzeug.datastructures import FileStorage
+
+from utils.file_processing import _read_csv, process_uploaded_file
+
+
+RAGGED_CSV = (
+    b"name,technique,tp,fp,tn,fn\n"
+    b"A,PCR,10,2,30,1\n"
+    b"B,LAMP,5,6,7\n"
+)
+
+
+def test_read_csv_accepts_short_rows():
+    df = _read_csv(io.BytesIO(RAGGED_CSV))
+
+    assert list(df['name']) == ['A', 'B']
+    assert df['fn'].isna().tolist() == [False, True]
+
+
+def test_upload_with_short_row_is_parsed():
+    upload = FileStorage(stream=io.BytesIO(RAGGED_CSV), filename='short_row.csv')
+
+    experiments = process_uploaded_file(upload)
+
+    assert [exp['name'] for exp in experiments][0] == 'A'
+
+
+def test_rows_with_missing_cells_are_skipped_and_counted(caplog):
+    csv = (
+        b"name,technique,tp,fp,tn,fn,description\n"
+        b"A,PCR,10,2,30,1,first\n"
+        b"B,LAMP,5,6,7\n"
+        b"C,RPA,1,1\n"
+        b",qPCR,3,3,3,3\n"
+        b"E\n"
+    )
+    upload = FileStorage(stream=io.BytesIO(csv), filename='missing_cells.csv')
+
+    with caplog.at_level('WARNING'):
+        experiments = process_uploaded_file(upload)
+
+    assert [(exp['name'], exp['technique']) for exp in experiments] == [('A', 'PCR'), ('nan', 'qPCR')]
+    assert experiments[1]['description'] == ''
+    assert ("Skipped 3 of 5 rows: 1 with invalid technique, "
+            "2 with missing or non-numeric confusion matrix values.") in caplog.text
@@ -0,0 +1,42 @@
+import base64
+
+import app  # noqa: F401  (loads the models before the report module imports them)
+from models import Experiment
+from utils.report_generation import (
+    create_cost_comparison_chart, create_statistics_chart,
+    render_cost_comparison_chart, render_statistics_chart
+)
+from utils.statistics import calculate_diagnostic_stats
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+
+def _experiment(technique, tp, fp, tn, fn, total_cost):
+    experiment = Experiment(name=technique, technique=technique, true_positive=tp, false_positive=fp,
+                            true_negative=tn, false_negative=fn, total_cost=total_cost)
+    experiment.set_statistics(calculate_diagnostic_stats(tp, fp, tn, fn))
+    return experiment
+
+
+def test_statistics_chart_stream_and_base64_agree():
+    experiment = _experiment('LAMP', 85, 3, 92, 5, 1234.5)
+
+    png = render_statistics_chart(experiment)
+
+    assert png.tell() == 0
+    assert png.getvalue().startswith(PNG_SIGNATURE)
+    assert base64.b64decode(create_statistics_chart(experiment)) == png.getvalue()
+
+
+def test_cost_comparison_chart_stream_and_base64_agree():
+    experiments = [_experiment('LAMP', 85, 3, 92, 5, 1234.5), _experiment('RPA', 5, 3, 9, 5, 5000)]
+
+    png = render_cost_comparison_chart(experiments)
+
+    assert png.getvalue().startswith(PNG_SIGNATURE)
+    assert base64.b64decode(create_cost_comparison_chart(experiments)) == png.getvalue()
+
+
+def test_cost_comparison_chart_without_experiments():
+    assert render_cost_comparison_chart([]) is None
+    assert create_cost_comparison_chart([]) == ""
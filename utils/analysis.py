@@ -0,0 +1,39 @@
+from dataclasses import dataclass
+from typing import Dict, Optional
+from utils.statistics import calculate_diagnostic_stats
+from utils.cost_analysis import get_technique_costs, calculate_total_cost
+
+@dataclass(slots=True)
+class ExperimentAnalysis:
+    """Statistics and cost figures derived from one experiment's confusion matrix"""
+    statistics: Dict
+    cost_data: Dict
+    total_samples: int
+    total_cost: float
+
+def analyze(technique: str, tp: int, fp: int, tn: int, fn: int, confidence: float = 0.95,
+            statistics: Optional[Dict] = None) -> ExperimentAnalysis:
+    """
+    Run the diagnostic and cost analysis for an experiment in one call
+    
+    Args:
+        technique: Name of the amplification technique
+        tp, fp, tn, fn: Confusion matrix values
+        confidence: Confidence level for intervals (default 0.95)
+        statistics: Precomputed diagnostic statistics, e.g. from a batch calculation
+    
+    Returns:
+        ExperimentAnalysis: Statistics, technique cost data, sample count and total cost
+    """
+    
+    total_samples = tp + fp + tn + fn
+    
+    if statistics is None:
+        statistics = calculate_diagnostic_stats(tp, fp, tn, fn, confidence)
+    
+    return ExperimentAnalysis(
+        statistics=statistics,
+        cost_data=get_technique_costs(technique),
+        total_samples=total_samples,
+        total_cost=calculate_total_cost(technique, total_samples)
+    )
@@ -1,5 +1,8 @@
+import functools
 import numpy as np
-from typing import Dict, List
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Tuple
 
 # Cost data based on real market research from web sources (in THB, ~35 THB = 1 USD)
 TECHNIQUE_COSTS = {
@@ -131,6 +134,138 @@ TECHNIQUE_COSTS = {
     }
 }
 
+@dataclass(slots=True)
+class TechniqueCostRow:
+    """Flat cost and performance record for one technique in one scenario"""
+    total_cost: float
+    cost_per_sample: float
+    equipment: float
+    reagents: float
+    maintenance: float
+    power: float
+    time_per_test: float
+    throughput_per_hour: float
+    field_suitability: str
+    operator_skill: str
+    
+    def to_nested(self) -> Dict:
+        """Return the nested dict layout with cost_breakdown and performance_metrics"""
+        return {
+            'total_cost': self.total_cost,
+            'cost_per_sample': self.cost_per_sample,
+            'cost_breakdown': {
+                'equipment': self.equipment,
+                'reagents': self.reagents,
+                'maintenance': self.maintenance,
+                'power': self.power
+            },
+            'performance_metrics': {
+                'time_per_test': self.time_per_test,
+                'throughput_per_hour': self.throughput_per_hour,
+                'field_suitability': self.field_suitability,
+                'operator_skill': self.operator_skill
+            }
+        }
+
+# Read-only view of TECHNIQUE_COSTS for in-module lookups, so shared entries
+# can be handed out without defensive copies
+_COSTS_RO = MappingProxyType({name: MappingProxyType(data) for name, data in TECHNIQUE_COSTS.items()})
+
+# Equipment is amortized over a typical 5-year lifespan
+EQUIPMENT_LIFESPAN_YEARS = 5
+
+# Typical Thai electricity rate in THB/kWh
+POWER_COST_PER_KWH = 4.2
+
+# Numeric cost fields laid out column-wise so whole scenarios can be priced
+# with array arithmetic instead of per-technique dict lookups
+_COST_COLUMNS = (
+    'equipment_cost',
+    'reagent_cost_per_test',
+    'maintenance_cost_annual',
+    'power_consumption_watts',
+    'time_per_test_minutes'
+)
+_TECH_INDEX = {name: i for i, name in enumerate(TECHNIQUE_COSTS)}
+_BASE_COSTS = np.array(
+    [[TECHNIQUE_COSTS[name][column] for column in _COST_COLUMNS] for name in TECHNIQUE_COSTS],
+    dtype=np.float64
+)
+
+# A sixth column folds watts * minutes * THB/kWh / (1000 W/kW * 60 min/h) into
+# a single power cost per sample, so pricing power is one multiply
+_COST_MATRIX = np.column_stack((
+    _BASE_COSTS,
+    _BASE_COSTS[:, 3] * _BASE_COSTS[:, 4] * POWER_COST_PER_KWH / 60000.0
+))
+
+def _known_techniques(techniques: List[str]) -> List[str]:
+    """Return the distinct known techniques in first-seen order"""
+    return [technique for technique in dict.fromkeys(techniques) if technique in _TECH_INDEX]
+
+def _cost_components(rows: np.ndarray, sample_count, study_duration_years: float) -> Tuple[np.ndarray, ...]:
+    """
+    Price equipment, reagents, maintenance and power for rows of _COST_MATRIX
+    
+    Args:
+        rows: Slice of _COST_MATRIX, one row per technique
+        sample_count: Number of samples, or a column vector of scenario sizes
+        study_duration_years: Study duration
+    
+    Returns:
+        tuple: (equipment, reagents, maintenance, power) cost arrays, broadcast
+        to the shape of sample_count against the technique rows
+    """
+    
+    equipment = rows[..., 0] / EQUIPMENT_LIFESPAN_YEARS * study_duration_years
+    reagents = rows[..., 1] * sample_count
+    maintenance = rows[..., 2] * study_duration_years
+    power = rows[..., 5] * sample_count
+    
+    equipment, reagents, maintenance, power = np.broadcast_arrays(equipment, reagents, maintenance, power)
+    return equipment, reagents, maintenance, power
+
+@functools.lru_cache(maxsize=4096)
+def _compute_breakdown(technique: str, sample_count: int, study_duration_years: float) -> Tuple[float, float, float, float]:
+    """Return the memoized (equipment, reagents, maintenance, power) costs for one technique"""
+    
+    rows = _COST_MATRIX[_TECH_INDEX[technique]]
+    equipment, reagents, maintenance, power = _cost_components(rows, sample_count, study_duration_years)
+    return float(equipment), float(reagents), float(maintenance), float(power)
+
+def _build_comparison(names: List[str], components, sample_count: int) -> Dict[str, 'TechniqueCostRow']:
+    """Assemble per-technique cost rows from priced cost components"""
+    
+    equipment, reagents, maintenance, power = (component.tolist() for component in components)
+    comparison = {}
+    
+    for i, technique in enumerate(names):
+        cost_data = _get_technique_costs_ref(technique)
+        total_cost = round(equipment[i] + reagents[i] + maintenance[i] + power[i], 2)
+        
+        comparison[technique] = TechniqueCostRow(
+            total_cost=total_cost,
+            cost_per_sample=total_cost / sample_count if sample_count > 0 else 0,
+            equipment=equipment[i],
+            reagents=reagents[i],
+            maintenance=maintenance[i],
+            power=power[i],
+            time_per_test=cost_data['time_per_test_minutes'],
+            throughput_per_hour=cost_data['throughput_samples_per_hour'],
+            field_suitability=cost_data['field_suitability'],
+            operator_skill=cost_data['operator_skill_required']
+        )
+    
+    return comparison
+
+def _get_technique_costs_ref(technique: str) -> Mapping:
+    """Return the shared, read-only cost entry for a technique without copying it"""
+    
+    if technique not in _COSTS_RO:
+        raise ValueError(f"Unknown technique: {technique}")
+    
+    return _COSTS_RO[technique]
+
 def get_technique_costs(technique: str) -> Dict:
     """
     Get cost data for a specific amplification technique
@@ -142,10 +277,7 @@ def get_technique_costs(technique: str) -> Dict:
         dict: Cost and performance data for the technique
     """
     
-    if technique not in TECHNIQUE_COSTS:
-        raise ValueError(f"Unknown technique: {technique}")
-    
-    return TECHNIQUE_COSTS[technique].copy()
+    return _get_technique_costs_ref(technique).copy()
 
 def calculate_total_cost(technique: str, sample_count: int, study_duration_years: float = 1.0) -> float:
     """
@@ -160,26 +292,19 @@ def calculate_total_cost(technique: str, sample_count: int, study_duration_years
         float: Total cost in THB
     """
     
-    cost_data = get_technique_costs(technique)
-    
-    # Equipment cost (amortized over 5 years typical lifespan)
-    equipment_annual_cost = cost_data['equipment_cost'] / 5
-    equipment_cost_study = equipment_annual_cost * study_duration_years
-    
-    # Reagent costs
-    reagent_cost_total = cost_data['reagent_cost_per_test'] * sample_count
-    
-    # Maintenance costs
-    maintenance_cost_study = cost_data['maintenance_cost_annual'] * study_duration_years
+    if technique not in _TECH_INDEX:
+        raise ValueError(f"Unknown technique: {technique}")
     
-    # Power costs (assuming 4.2 THB/kWh, typical Thai electricity rate)
-    power_cost_per_kwh = 4.2
-    time_per_test_hours = cost_data['time_per_test_minutes'] / 60
-    power_cost_total = (cost_data['power_consumption_watts'] / 1000) * time_per_test_hours * sample_count * power_cost_per_kwh
+    return round(sum(_compute_breakdown(technique, sample_count, study_duration_years)), 2)
+
+def _compare_technique_rows(techniques: List[str], sample_count: int, study_duration_years: float = 1.0) -> Dict[str, TechniqueCostRow]:
+    """Price the known techniques and return one flat TechniqueCostRow per technique"""
     
-    total_cost = equipment_cost_study + reagent_cost_total + maintenance_cost_study + power_cost_total
+    names = _known_techniques(techniques)
+    indices = [_TECH_INDEX[name] for name in names]
+    components = _cost_components(_COST_MATRIX[indices], sample_count, study_duration_years)
     
-    return round(total_cost, 2)
+    return _build_comparison(names, components, sample_count)
 
 def compare_technique_costs(techniques: List[str], sample_count: int, study_duration_years: float = 1.0) -> Dict:
     """
@@ -194,45 +319,8 @@ def compare_technique_costs(techniques: List[str], sample_count: int, study_dura
         dict: Comparison results with cost breakdown
     """
     
-    comparison = {}
-    
-    for technique in techniques:
-        if technique not in TECHNIQUE_COSTS:
-            continue
-            
-        cost_data = get_technique_costs(technique)
-        total_cost = calculate_total_cost(technique, sample_count, study_duration_years)
-        
-        # Calculate cost per sample
-        cost_per_sample = total_cost / sample_count if sample_count > 0 else 0
-        
-        # Calculate component costs
-        equipment_annual_cost = cost_data['equipment_cost'] / 5
-        equipment_cost_study = equipment_annual_cost * study_duration_years
-        reagent_cost_total = cost_data['reagent_cost_per_test'] * sample_count
-        maintenance_cost_study = cost_data['maintenance_cost_annual'] * study_duration_years
-        
-        time_per_test_hours = cost_data['time_per_test_minutes'] / 60
-        power_cost_total = (cost_data['power_consumption_watts'] / 1000) * time_per_test_hours * sample_count * 4.2
-        
-        comparison[technique] = {
-            'total_cost': total_cost,
-            'cost_per_sample': cost_per_sample,
-            'cost_breakdown': {
-                'equipment': equipment_cost_study,
-                'reagents': reagent_cost_total,
-                'maintenance': maintenance_cost_study,
-                'power': power_cost_total
-            },
-            'performance_metrics': {
-                'time_per_test': cost_data['time_per_test_minutes'],
-                'throughput_per_hour': cost_data['throughput_samples_per_hour'],
-                'field_suitability': cost_data['field_suitability'],
-                'operator_skill': cost_data['operator_skill_required']
-            }
-        }
-    
-    return comparison
+    rows = _compare_technique_rows(techniques, sample_count, study_duration_years)
+    return {technique: row.to_nested() for technique, row in rows.items()}
 
 def calculate_cost_effectiveness(technique: str, sensitivity: float, specificity: float, sample_count: int) -> Dict:
     """
@@ -300,12 +388,18 @@ def rank_techniques_by_cost_effectiveness(techniques_data: List[Dict]) -> List[D
         list: Ranked list of techniques
     """
     
-    # Sort by total cost with errors (lower is better)
-    ranked = sorted(techniques_data, key=lambda x: x['total_cost_with_errors'])
+    # Sort by total cost with errors (lower is better); the stable sort keeps
+    # tied techniques in their input order, as sorted() did
+    costs = np.fromiter(
+        (technique_data['total_cost_with_errors'] for technique_data in techniques_data),
+        dtype=np.float64,
+        count=len(techniques_data)
+    )
+    ranked = [techniques_data[i] for i in np.argsort(costs, kind='stable')]
     
     # Add ranking
-    for i, technique_data in enumerate(ranked):
-        technique_data['cost_effectiveness_rank'] = i + 1
+    for rank, technique_data in enumerate(ranked, 1):
+        technique_data['cost_effectiveness_rank'] = rank
     
     return ranked
 
@@ -327,22 +421,39 @@ def generate_cost_summary(techniques: List[str], sample_counts: List[int]) -> Di
         'recommendations': {}
     }
     
-    for sample_count in sample_counts:
+    names = _known_techniques(techniques)
+    if sample_counts and not names:
+        raise ValueError("No known techniques to compare")
+    indices = [_TECH_INDEX[name] for name in names]
+    
+    # Evaluate every (scenario, technique) cell at once: sample counts form a
+    # column vector that broadcasts against the per-technique cost rows
+    counts = np.asarray(sample_counts, dtype=np.float64).reshape(-1, 1)
+    components = _cost_components(_COST_MATRIX[indices], counts, 1.0)
+    
+    for s, sample_count in enumerate(sample_counts):
         scenario_name = f"{sample_count}_samples"
-        comparison = compare_technique_costs(techniques, sample_count)
-        summary['scenarios'][scenario_name] = comparison
+        comparison = _build_comparison(names, [component[s] for component in components], sample_count)
+        summary['scenarios'][scenario_name] = {technique: row.to_nested() for technique, row in comparison.items()}
+        
+        # Find the cheapest and most expensive technique in a single pass
+        min_cost_technique, min_cost, max_cost = None, float('inf'), float('-inf')
+        for technique, row in comparison.items():
+            cost = row.total_cost
+            if cost < min_cost:
+                min_cost_technique, min_cost = technique, cost
+            if cost > max_cost:
+                max_cost = cost
         
-        # Find most cost-effective technique for this scenario
-        min_cost_technique = min(comparison.keys(), key=lambda t: comparison[t]['total_cost'])
         summary['recommendations'][scenario_name] = {
             'most_cost_effective': min_cost_technique,
-            'cost_savings_vs_most_expensive': max(comparison[t]['total_cost'] for t in comparison) - comparison[min_cost_technique]['total_cost']
+            'cost_savings_vs_most_expensive': max_cost - min_cost
         }
     
     # Overall technique characteristics
     for technique in techniques:
         if technique in TECHNIQUE_COSTS:
-            cost_data = get_technique_costs(technique)
+            cost_data = _get_technique_costs_ref(technique)
             summary['technique_comparison'][technique] = {
                 'equipment_cost': cost_data['equipment_cost'],
                 'reagent_cost_per_test': cost_data['reagent_cost_per_test'],
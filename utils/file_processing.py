@@ -1,10 +1,37 @@
+import functools
 import pandas as pd
 import numpy as np
 from werkzeug.datastructures import FileStorage
 import io
 import logging
+import os
+from openpyxl import load_workbook
 from typing import List, Dict, Optional
 
+try:
+    from pyarrow import ArrowInvalid
+except ImportError:  # pyarrow is optional; _read_csv then uses the C parser directly
+    class ArrowInvalid(Exception):
+        """Placeholder so _read_csv can name the exception without pyarrow"""
+
+try:
+    import xlsxwriter  # noqa: F401  (only probed; pandas loads it by engine name)
+    _TEMPLATE_EXCEL_ENGINE = 'xlsxwriter'
+except ImportError:  # xlsxwriter is optional; openpyxl writes the same workbook, just slower
+    _TEMPLATE_EXCEL_ENGINE = 'openpyxl'
+
+# Largest upload accepted by process_uploaded_file
+MAX_UPLOAD_BYTES = 16 * 1024 * 1024
+
+VALID_TECHNIQUES = ('PCR', 'qPCR', 'LAMP', 'RPA', 'NASBA', 'TMA', 'HDA', 'SDA', 'NEAR')
+
+# Upper-cased technique name -> canonical spelling, built once for case-insensitive matching
+_UPPER_TO_CANON = {technique.upper(): technique for technique in VALID_TECHNIQUES}
+_CANON_TECHNIQUES = np.array(list(_UPPER_TO_CANON.values()), dtype=object)
+
+# Categorical dtype over the upper-cased names; unrecognized techniques get code -1
+_TECHNIQUE_DTYPE = pd.CategoricalDtype(categories=list(_UPPER_TO_CANON))
+
 def process_uploaded_file(file: FileStorage) -> List[Dict]:
     """
     Process uploaded CSV or Excel file containing experimental data
@@ -17,16 +44,20 @@ def process_uploaded_file(file: FileStorage) -> List[Dict]:
     """
     
     try:
-        filename = file.filename.lower()
-        
         # Read file based on extension
-        if filename.endswith('.csv'):
-            df = pd.read_csv(file)
-        elif filename.endswith(('.xlsx', '.xls')):
-            df = pd.read_excel(file)
-        else:
+        extension = os.path.splitext(file.filename)[1].lower()
+        reader = _READERS.get(extension)
+        if reader is None:
             raise ValueError("Unsupported file format. Please upload CSV or Excel files.")
         
+        # Buffer the upload once so fallback readers can rewind it, reading
+        # one byte past the cap to detect oversized files without loading them
+        buffer = io.BytesIO(file.read(MAX_UPLOAD_BYTES + 1))
+        if buffer.getbuffer().nbytes > MAX_UPLOAD_BYTES:
+            raise ValueError(f"File is too large. The maximum upload size is {MAX_UPLOAD_BYTES // (1024 * 1024)} MB.")
+        
+        df = reader(buffer)
+        
         # Validate and process the dataframe
         experiments_data = validate_and_extract_data(df)
         
@@ -36,6 +67,75 @@ def process_uploaded_file(file: FileStorage) -> List[Dict]:
         logging.error(f"Error processing uploaded file: {str(e)}")
         raise
 
+def _read_csv(file) -> pd.DataFrame:
+    """
+    Parse an uploaded CSV, preferring pyarrow's multithreaded reader
+    
+    Files pyarrow cannot parse, such as ones with rows missing trailing
+    fields, are re-read with the default C parser.
+    
+    Args:
+        file: Readable, seekable file object
+    
+    Returns:
+        DataFrame: Parsed CSV contents
+    """
+    
+    try:
+        return pd.read_csv(file, engine='pyarrow')
+    except (ImportError, ArrowInvalid, pd.errors.ParserError):
+        # pyarrow is optional, and it rejects ragged rows that the default C
+        # parser pads with NaN; either way re-read with the C parser
+        file.seek(0)
+        return pd.read_csv(file)
+
+def _read_xlsx(file) -> pd.DataFrame:
+    """
+    Parse the first sheet of an uploaded .xlsx workbook
+    
+    Tries the Rust-backed calamine engine first (pandas >= 2.2 with
+    python-calamine), then a streaming openpyxl read-only load, and finally
+    the default pandas reader.
+    
+    Args:
+        file: Readable, seekable file object
+    
+    Returns:
+        DataFrame: Sheet contents with the first row as the header
+    """
+    
+    try:
+        return pd.read_excel(file, engine='calamine')
+    except (ImportError, ValueError):
+        # python-calamine is missing or this pandas does not know the engine
+        file.seek(0)
+    
+    try:
+        workbook = load_workbook(file, read_only=True, data_only=True)
+    except Exception:
+        file.seek(0)
+        return pd.read_excel(file)
+    
+    try:
+        rows = workbook.worksheets[0].values
+        header = next(rows, None)
+        if header is None:
+            return pd.DataFrame()
+        return pd.DataFrame(list(rows), columns=header)
+    finally:
+        workbook.close()
+
+def _read_xls(file) -> pd.DataFrame:
+    """Parse a legacy .xls workbook, which only xlrd can read"""
+    return pd.read_excel(file, engine='xlrd')
+
+# Upload readers keyed by lower-cased file extension
+_READERS = {
+    '.csv': _read_csv,
+    '.xlsx': _read_xlsx,
+    '.xls': _read_xls
+}
+
 def validate_and_extract_data(df: pd.DataFrame) -> List[Dict]:
     """
     Validate and extract experiment data from DataFrame
@@ -63,16 +163,17 @@ def validate_and_extract_data(df: pd.DataFrame) -> List[Dict]:
         'false_negative': ['false_negative', 'fn', 'false_neg', 'incorrect_negative']
     }
     
-    # Map column names to standardized names
-    df_columns_lower = [col.lower().replace(' ', '_') for col in df.columns]
+    # Map column names to standardized names; the first column wins when
+    # several normalize to the same key
+    lower_to_orig = {}
+    for col in df.columns:
+        lower_to_orig.setdefault(str(col).lower().replace(' ', '_'), col)
     column_map = {}
     
     for standard_name, possible_names in column_mappings.items():
-        for possible_name in possible_names:
-            if possible_name in df_columns_lower:
-                original_col = df.columns[df_columns_lower.index(possible_name)]
-                column_map[standard_name] = original_col
-                break
+        original_col = next((lower_to_orig[p] for p in possible_names if p in lower_to_orig), None)
+        if original_col is not None:
+            column_map[standard_name] = original_col
     
     # Check for required columns
     required_columns = ['name', 'technique', 'true_positive', 'false_positive', 'true_negative', 'false_negative']
@@ -81,65 +182,67 @@ def validate_and_extract_data(df: pd.DataFrame) -> List[Dict]:
     if missing_columns:
         raise ValueError(f"Missing required columns: {missing_columns}. Please ensure your file contains these columns.")
     
-    experiments_data = []
-    valid_techniques = ['PCR', 'qPCR', 'LAMP', 'RPA', 'NASBA', 'TMA', 'HDA', 'SDA', 'NEAR']
-    
-    for index, row in df.iterrows():
-        try:
-            # Extract data using column mapping
-            name = str(row[column_map['name']]).strip()
-            technique = str(row[column_map['technique']]).strip()
-            
-            # Validate technique
-            technique_upper = technique.upper()
-            if technique_upper not in [t.upper() for t in valid_techniques]:
-                logging.warning(f"Row {index + 1}: Invalid technique '{technique}'. Skipping.")
-                continue
-            
-            # Find matching technique (case insensitive)
-            technique_matched = next(t for t in valid_techniques if t.upper() == technique_upper)
-            
-            # Extract confusion matrix values
-            tp = int(row[column_map['true_positive']])
-            fp = int(row[column_map['false_positive']])
-            tn = int(row[column_map['true_negative']])
-            fn = int(row[column_map['false_negative']])
-            
-            # Validate confusion matrix values
-            if tp < 0 or fp < 0 or tn < 0 or fn < 0:
-                logging.warning(f"Row {index + 1}: Negative values in confusion matrix. Skipping.")
-                continue
-            
-            if tp + fp + tn + fn == 0:
-                logging.warning(f"Row {index + 1}: All confusion matrix values are zero. Skipping.")
-                continue
-            
-            # Extract optional description
-            description = ""
-            if 'description' in column_map:
-                description = str(row[column_map['description']]) if pd.notna(row[column_map['description']]) else ""
-            
-            experiment_data = {
-                'name': name,
-                'description': description,
-                'technique': technique_matched,
-                'tp': tp,
-                'fp': fp,
-                'tn': tn,
-                'fn': fn
-            }
-            
-            experiments_data.append(experiment_data)
-            
-        except Exception as e:
-            logging.warning(f"Row {index + 1}: Error processing data - {str(e)}. Skipping.")
-            continue
+    count_columns = ['true_positive', 'false_positive', 'true_negative', 'false_negative']
+    
+    # Match techniques case-insensitively in one pass; unknown values get code -1
+    techniques = df[column_map['technique']].astype(str).str.strip().str.upper()
+    technique_codes = pd.Categorical(techniques, dtype=_TECHNIQUE_DTYPE).codes
+    known_technique = technique_codes != -1
+    
+    # Coerce the confusion matrix columns together; unparseable cells become NaN
+    counts = df[[column_map[col] for col in count_columns]].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+    numeric = np.isfinite(counts).all(axis=1)
+    counts = np.trunc(np.where(numeric[:, None], counts, 0)).astype(np.int64)
+    negative = (counts < 0).any(axis=1)
+    all_zero = counts.sum(axis=1) == 0
+    
+    # Rows are checked in the same order as before: technique, parsing, sign, total
+    skipped = {
+        'invalid technique': ~known_technique,
+        'missing or non-numeric confusion matrix values': known_technique & ~numeric,
+        'negative values in confusion matrix': known_technique & numeric & negative,
+        'all confusion matrix values zero': known_technique & numeric & ~negative & all_zero
+    }
+    valid_mask = known_technique & numeric & ~negative & ~all_zero
+    
+    skipped_counts = {reason: int(mask.sum()) for reason, mask in skipped.items() if mask.any()}
+    if skipped_counts:
+        details = ', '.join(f"{count} with {reason}" for reason, count in skipped_counts.items())
+        logging.warning(f"Skipped {sum(skipped_counts.values())} of {len(df)} rows: {details}.")
+    
+    descriptions = ""
+    if 'description' in column_map:
+        descriptions = df[column_map['description']].fillna('').astype(str).str.strip().to_numpy()
+    
+    extracted = pd.DataFrame({
+        # Convert through numpy so a blank name becomes 'nan', as str() gives,
+        # instead of staying a float NaN under pandas' string dtype
+        'name': np.char.strip(df[column_map['name']].to_numpy(dtype=object).astype(str)),
+        'description': descriptions,
+        'technique': _CANON_TECHNIQUES[technique_codes.clip(min=0)],
+        'tp': counts[:, 0],
+        'fp': counts[:, 1],
+        'tn': counts[:, 2],
+        'fn': counts[:, 3]
+    })
+    experiments_data = extracted.loc[valid_mask].to_dict('records')
     
     if not experiments_data:
         raise ValueError("No valid experiment data found in file.")
     
     return experiments_data
 
+# Example rows shared by the downloadable CSV and Excel templates
+_TEMPLATE_DATA = {
+    'name': ['Experiment_1', 'Experiment_2', 'Experiment_3'],
+    'description': ['qPCR validation study', 'LAMP comparison test', 'RPA field trial'],
+    'technique': ['qPCR', 'LAMP', 'RPA'],
+    'true_positive': [85, 78, 82],
+    'false_positive': [3, 5, 4],
+    'true_negative': [92, 88, 89],
+    'false_negative': [5, 9, 7]
+}
+
 def generate_template_csv() -> str:
     """
     Generate a CSV template string for users to download
@@ -148,22 +251,7 @@ def generate_template_csv() -> str:
         str: CSV template content
     """
     
-    template_data = {
-        'name': ['Experiment_1', 'Experiment_2', 'Experiment_3'],
-        'description': ['qPCR validation study', 'LAMP comparison test', 'RPA field trial'],
-        'technique': ['qPCR', 'LAMP', 'RPA'],
-        'true_positive': [85, 78, 82],
-        'false_positive': [3, 5, 4],
-        'true_negative': [92, 88, 89],
-        'false_negative': [5, 9, 7]
-    }
-    
-    df = pd.DataFrame(template_data)
-    
-    # Convert to CSV string
-    csv_buffer = io.StringIO()
-    df.to_csv(csv_buffer, index=False)
-    return csv_buffer.getvalue()
+    return _build_template_csv()
 
 def generate_template_excel() -> bytes:
     """
@@ -173,21 +261,28 @@ def generate_template_excel() -> bytes:
         bytes: Excel file content
     """
     
-    template_data = {
-        'name': ['Experiment_1', 'Experiment_2', 'Experiment_3'],
-        'description': ['qPCR validation study', 'LAMP comparison test', 'RPA field trial'],
-        'technique': ['qPCR', 'LAMP', 'RPA'],
-        'true_positive': [85, 78, 82],
-        'false_positive': [3, 5, 4],
-        'true_negative': [92, 88, 89],
-        'false_negative': [5, 9, 7]
-    }
+    return _build_template_excel()
+
+@functools.lru_cache(maxsize=None)
+def _build_template_csv() -> str:
+    """Serialize the CSV template once; the content never changes"""
+    
+    df = pd.DataFrame(_TEMPLATE_DATA)
+    
+    # Convert to CSV string
+    csv_buffer = io.StringIO()
+    df.to_csv(csv_buffer, index=False)
+    return csv_buffer.getvalue()
+
+@functools.lru_cache(maxsize=None)
+def _build_template_excel() -> bytes:
+    """Serialize the Excel template once; the content never changes"""
     
-    df = pd.DataFrame(template_data)
+    df = pd.DataFrame(_TEMPLATE_DATA)
     
     # Create Excel file in memory
     excel_buffer = io.BytesIO()
-    with pd.ExcelWriter(excel_buffer, engine='openpyxl') as writer:
+    with pd.ExcelWriter(excel_buffer, engine=_TEMPLATE_EXCEL_ENGINE) as writer:
         df.to_excel(writer, sheet_name='Experiments', index=False)
         
         # Add instructions sheet
@@ -267,6 +362,59 @@ def validate_confusion_matrix_data(tp: int, fp: int, tn: int, fn: int) -> Dict[s
         'is_valid': len(errors) == 0
     }
 
+# Per-row result bits emitted by _validation_flags
+_FLAG_NEGATIVE = 1
+_FLAG_ZERO_TOTAL = 2
+_FLAG_SMALL_SAMPLE = 4
+_FLAG_NO_POSITIVE = 8
+_FLAG_NO_NEGATIVE = 16
+_FLAG_IMBALANCED = 32
+_FLAG_PERFECT = 64
+_FLAG_NO_CORRECT = 128
+_ERROR_FLAGS = _FLAG_NEGATIVE | _FLAG_ZERO_TOTAL
+
+def _validation_flags(counts: np.ndarray):
+    """Apply the validate_confusion_matrix_data checks to every (tp, fp, tn, fn) row"""
+    tp, fp, tn, fn = counts.T
+    total = counts.sum(axis=1)
+    positive_count = tp + fn
+    negative_count = fp + tn
+    has_total = total > 0
+    balanced = has_total & (positive_count > 0) & (negative_count > 0)
+    
+    ratios = np.zeros(len(counts), np.float64)
+    np.divide(np.maximum(positive_count, negative_count), np.minimum(positive_count, negative_count),
+              out=ratios, where=balanced)
+    
+    flags = np.zeros(len(counts), np.uint8)
+    flags[(counts < 0).any(axis=1)] |= _FLAG_NEGATIVE
+    flags[total == 0] |= _FLAG_ZERO_TOTAL
+    flags[has_total & (total < 10)] |= _FLAG_SMALL_SAMPLE
+    flags[has_total & (positive_count == 0)] |= _FLAG_NO_POSITIVE
+    flags[has_total & (positive_count != 0) & (negative_count == 0)] |= _FLAG_NO_NEGATIVE
+    flags[balanced & (ratios > 10)] |= _FLAG_IMBALANCED
+    flags[has_total & (fp == 0) & (fn == 0)] |= _FLAG_PERFECT
+    flags[has_total & (tp == 0) & (tn == 0)] |= _FLAG_NO_CORRECT
+    
+    return flags, ratios
+
+def _flag_warnings(row_flags: int, total: int, ratio: float) -> List[str]:
+    """Translate warning bits into the messages used by validate_confusion_matrix_data"""
+    warnings = []
+    if row_flags & _FLAG_SMALL_SAMPLE:
+        warnings.append(f"Small sample size (n={total}) may lead to unreliable statistical estimates")
+    if row_flags & _FLAG_NO_POSITIVE:
+        warnings.append("No positive cases in the dataset")
+    if row_flags & _FLAG_NO_NEGATIVE:
+        warnings.append("No negative cases in the dataset")
+    if row_flags & _FLAG_IMBALANCED:
+        warnings.append(f"Highly imbalanced dataset (ratio: {ratio:.1f}:1)")
+    if row_flags & _FLAG_PERFECT:
+        warnings.append("Perfect classification detected - verify data accuracy")
+    if row_flags & _FLAG_NO_CORRECT:
+        warnings.append("No correct classifications detected - verify data accuracy")
+    return warnings
+
 def batch_validate_experiments(experiments_data: List[Dict]) -> Dict:
     """
     Validate a batch of experiment data
@@ -278,25 +426,37 @@ def batch_validate_experiments(experiments_data: List[Dict]) -> Dict:
         dict: Batch validation results
     """
     
+    counts = np.fromiter(
+        (exp_data[key] for exp_data in experiments_data for key in ('tp', 'fp', 'tn', 'fn')),
+        dtype=np.int64,
+        count=4 * len(experiments_data)
+    ).reshape(-1, 4)
+    flags, ratios = _validation_flags(counts)
+    
     valid_experiments = []
     invalid_experiments = []
     warnings_summary = []
     
     for i, exp_data in enumerate(experiments_data):
-        validation = validate_confusion_matrix_data(
-            exp_data['tp'], exp_data['fp'], 
-            exp_data['tn'], exp_data['fn']
-        )
+        row_flags = int(flags[i])
         
-        if validation['is_valid']:
-            valid_experiments.append(exp_data)
-            if validation['warnings']:
-                warnings_summary.extend([f"Experiment {i+1}: {w}" for w in validation['warnings']])
-        else:
+        if row_flags & _ERROR_FLAGS:
+            errors = []
+            if row_flags & _FLAG_NEGATIVE:
+                errors.append("All confusion matrix values must be non-negative")
+            if row_flags & _FLAG_ZERO_TOTAL:
+                errors.append("At least one confusion matrix value must be greater than zero")
             invalid_experiments.append({
                 'experiment': exp_data,
-                'errors': validation['errors']
+                'errors': errors
             })
+            continue
+        
+        valid_experiments.append(exp_data)
+        if row_flags:
+            warnings_summary.extend(
+                f"Experiment {i+1}: {w}" for w in _flag_warnings(row_flags, int(counts[i].sum()), float(ratios[i]))
+            )
     
     return {
         'valid_count': len(valid_experiments),
@@ -1,97 +1,191 @@
+import functools
 import io
-import pandas as pd
+import numpy as np
 from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
-from reportlab.graphics.shapes import Drawing
-from reportlab.graphics.charts.barcharts import VerticalBarChart
-from reportlab.graphics.charts.piecharts import Pie
-import matplotlib.pyplot as plt
-import matplotlib
-matplotlib.use('Agg')  # Use non-interactive backend
-import seaborn as sns
+from PIL import Image as PILImage, ImageDraw, ImageFont
 from datetime import datetime
+from typing import BinaryIO, Dict, Iterable, Optional, Sequence, Tuple
 import base64
 from models import Experiment
-from utils.statistics import calculate_diagnostic_stats
 from utils.cost_analysis import get_technique_costs
 
-def generate_pdf_report(experiment: Experiment) -> io.BytesIO:
+try:
+    import xlsxwriter
+except ImportError:  # xlsxwriter is optional; openpyxl writes the same workbook, just slower
+    xlsxwriter = None
+    from openpyxl import Workbook as _OpenpyxlWorkbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font
+
+# Fixed sheet headers and row labels of the Excel report
+_SUMMARY_HEADER = ('Experiment Information', 'Values')
+_SUMMARY_LABELS = (
+    'Name', 'Technique', 'Date Created', 'Description',
+    'True Positives', 'False Positives', 'True Negatives', 'False Negatives',
+    'Total Samples'
+)
+_STATS_HEADER = ('Metric', 'Value', 'Percentage', 'CI_Lower', 'CI_Upper')
+_STATS_INTERVAL_METRICS = (
+    ('Sensitivity', 'sensitivity'),
+    ('Specificity', 'specificity'),
+    ('Positive Predictive Value', 'ppv'),
+    ('Negative Predictive Value', 'npv'),
+    ('Accuracy', 'accuracy')
+)
+_COST_HEADER = ('Cost Component', 'Value')
+_COST_LABELS = (
+    'Equipment Cost', 'Equipment Cost Range (Min)', 'Equipment Cost Range (Max)',
+    'Reagent Cost per Test', 'Reagent Cost Range (Min)', 'Reagent Cost Range (Max)',
+    'Total Samples', 'Total Reagent Cost', 'Maintenance Cost (Annual)',
+    'Power Consumption (Watts)', 'Estimated Total Cost', 'Cost per Sample'
+)
+_PERFORMANCE_HEADER = ('Characteristic', 'Value')
+_PERFORMANCE_FIELDS = (
+    ('Temperature Requirement', 'temperature_requirement'),
+    ('Time per Test (minutes)', 'time_per_test_minutes'),
+    ('Throughput per Hour', 'throughput_samples_per_hour'),
+    ('Power Consumption (watts)', 'power_consumption_watts'),
+    ('Operator Skill Required', 'operator_skill_required'),
+    ('Field Suitability', 'field_suitability'),
+    ('Multiplexing Capability', 'multiplexing_capability')
+)
+_RAW_HEADER = ('Classification', 'Count', 'Percentage')
+_RAW_LABELS = ('True Positive', 'False Positive', 'True Negative', 'False Negative')
+
+# Paragraph styles are built once at import and shared by every report;
+# reportlab only reads them while laying out a document
+_STYLES = getSampleStyleSheet()
+
+_TITLE_STYLE = ParagraphStyle(
+    'CustomTitle',
+    parent=_STYLES['Heading1'],
+    fontSize=20,
+    textColor=colors.HexColor('#2c3e50'),
+    alignment=1,  # Center alignment
+    spaceAfter=30
+)
+
+_INFO_STYLE = ParagraphStyle(
+    'InfoStyle',
+    parent=_STYLES['Normal'],
+    fontSize=12,
+    spaceAfter=10
+)
+
+_FOOTER_STYLE = ParagraphStyle(
+    'Footer',
+    parent=_STYLES['Normal'],
+    fontSize=8,
+    textColor=colors.grey,
+    alignment=1
+)
+
+# Table styles are likewise shared; Table.setStyle only reads their commands
+_CONFUSION_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3498db')),
+    ('BACKGROUND', (0, 1), (0, -1), colors.HexColor('#3498db')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('TEXTCOLOR', (0, 1), (0, -1), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 12),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+])
+
+_STATS_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2ecc71')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTNAME', (0, 1), (0, -1), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 10),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#ecf0f1')])
+])
+
+_COST_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e74c3c')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTNAME', (0, 1), (0, -1), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 10),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#fadbd8')])
+])
+
+_CHAR_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#9b59b6')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTNAME', (0, 1), (0, -1), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 10),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#ebdef0')])
+])
+
+def generate_pdf_report(experiment: Experiment, output: Optional[BinaryIO] = None,
+                        statistics: Optional[Dict] = None) -> BinaryIO:
     """
     Generate comprehensive PDF report for an experiment
     
     Args:
         experiment: Experiment model instance
+        output: Writable binary stream to render into (default: new in-memory buffer)
+        statistics: Already decoded experiment statistics (default: decoded from the experiment)
     
     Returns:
-        io.BytesIO: PDF file buffer
+        BinaryIO: PDF file stream, rewound to the start
     """
     
-    buffer = io.BytesIO()
+    buffer = output if output is not None else io.BytesIO()
     doc = SimpleDocTemplate(buffer, pagesize=A4)
-    styles = getSampleStyleSheet()
     story = []
     
-    # Title
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=20,
-        textColor=colors.HexColor('#2c3e50'),
-        alignment=1,  # Center alignment
-        spaceAfter=30
-    )
+    tp, fp, tn, fn = experiment.true_positive, experiment.false_positive, experiment.true_negative, experiment.false_negative
+    total_samples = tp + fp + tn + fn
     
-    story.append(Paragraph("Bioinformatics Amplification Analysis Report", title_style))
+    # Title
+    story.append(Paragraph("Bioinformatics Amplification Analysis Report", _TITLE_STYLE))
     story.append(Spacer(1, 20))
     
     # Experiment Information
-    info_style = ParagraphStyle(
-        'InfoStyle',
-        parent=styles['Normal'],
-        fontSize=12,
-        spaceAfter=10
-    )
-    
-    story.append(Paragraph("<b>Experiment Information</b>", styles['Heading2']))
-    story.append(Paragraph(f"<b>Name:</b> {experiment.name}", info_style))
-    story.append(Paragraph(f"<b>Technique:</b> {experiment.technique}", info_style))
-    story.append(Paragraph(f"<b>Date Created:</b> {experiment.created_at.strftime('%Y-%m-%d %H:%M')}", info_style))
+    story.append(Paragraph("<b>Experiment Information</b>", _STYLES['Heading2']))
+    story.append(Paragraph(f"<b>Name:</b> {experiment.name}", _INFO_STYLE))
+    story.append(Paragraph(f"<b>Technique:</b> {experiment.technique}", _INFO_STYLE))
+    story.append(Paragraph(f"<b>Date Created:</b> {experiment.created_at.strftime('%Y-%m-%d %H:%M')}", _INFO_STYLE))
     if experiment.description:
-        story.append(Paragraph(f"<b>Description:</b> {experiment.description}", info_style))
+        story.append(Paragraph(f"<b>Description:</b> {experiment.description}", _INFO_STYLE))
     story.append(Spacer(1, 20))
     
     # Confusion Matrix
-    story.append(Paragraph("<b>Confusion Matrix</b>", styles['Heading2']))
+    story.append(Paragraph("<b>Confusion Matrix</b>", _STYLES['Heading2']))
     
     confusion_data = [
         ['', 'Predicted Positive', 'Predicted Negative'],
-        ['Actual Positive', str(experiment.true_positive), str(experiment.false_negative)],
-        ['Actual Negative', str(experiment.false_positive), str(experiment.true_negative)]
+        ['Actual Positive', str(tp), str(fn)],
+        ['Actual Negative', str(fp), str(tn)]
     ]
     
     confusion_table = Table(confusion_data)
-    confusion_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3498db')),
-        ('BACKGROUND', (0, 1), (0, -1), colors.HexColor('#3498db')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('TEXTCOLOR', (0, 1), (0, -1), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 12),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-    ]))
+    confusion_table.setStyle(_CONFUSION_STYLE)
     
     story.append(confusion_table)
     story.append(Spacer(1, 20))
     
     # Diagnostic Statistics
-    story.append(Paragraph("<b>Diagnostic Statistics</b>", styles['Heading2']))
+    story.append(Paragraph("<b>Diagnostic Statistics</b>", _STYLES['Heading2']))
     
-    stats = experiment.get_statistics()
+    stats = statistics if statistics is not None else experiment.get_statistics()
     
     stats_data = [
         ['Metric', 'Value (%)', '95% Confidence Interval'],
@@ -110,26 +204,15 @@ def generate_pdf_report(experiment: Experiment) -> io.BytesIO:
     ]
     
     stats_table = Table(stats_data, colWidths=[2.5*inch, 1.5*inch, 2*inch])
-    stats_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2ecc71')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTNAME', (0, 1), (0, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#ecf0f1')])
-    ]))
+    stats_table.setStyle(_STATS_STYLE)
     
     story.append(stats_table)
     story.append(Spacer(1, 20))
     
     # Cost Analysis
-    story.append(Paragraph("<b>Cost Analysis</b>", styles['Heading2']))
+    story.append(Paragraph("<b>Cost Analysis</b>", _STYLES['Heading2']))
     
     cost_data = get_technique_costs(experiment.technique)
-    total_samples = experiment.true_positive + experiment.false_positive + experiment.true_negative + experiment.false_negative
     
     cost_analysis_data = [
         ['Cost Component', 'Value'],
@@ -142,23 +225,13 @@ def generate_pdf_report(experiment: Experiment) -> io.BytesIO:
     ]
     
     cost_table = Table(cost_analysis_data, colWidths=[3*inch, 2*inch])
-    cost_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e74c3c')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTNAME', (0, 1), (0, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#fadbd8')])
-    ]))
+    cost_table.setStyle(_COST_STYLE)
     
     story.append(cost_table)
     story.append(Spacer(1, 20))
     
     # Technique Characteristics
-    story.append(Paragraph("<b>Technique Characteristics</b>", styles['Heading2']))
+    story.append(Paragraph("<b>Technique Characteristics</b>", _STYLES['Heading2']))
     
     char_data = [
         ['Characteristic', 'Value'],
@@ -172,194 +245,136 @@ def generate_pdf_report(experiment: Experiment) -> io.BytesIO:
     ]
     
     char_table = Table(char_data, colWidths=[3*inch, 2*inch])
-    char_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#9b59b6')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTNAME', (0, 1), (0, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#ebdef0')])
-    ]))
+    char_table.setStyle(_CHAR_STYLE)
     
     story.append(char_table)
     
     # Footer
     story.append(Spacer(1, 40))
-    footer_style = ParagraphStyle(
-        'Footer',
-        parent=styles['Normal'],
-        fontSize=8,
-        textColor=colors.grey,
-        alignment=1
-    )
-    story.append(Paragraph(f"Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} by Bioinformatics Amplification Analysis Tool", footer_style))
+    story.append(Paragraph(f"Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} by Bioinformatics Amplification Analysis Tool", _FOOTER_STYLE))
     
     # Build PDF
     doc.build(story)
     buffer.seek(0)
     return buffer
 
-def generate_excel_report(experiment: Experiment) -> io.BytesIO:
+def generate_excel_report(experiment: Experiment, output: Optional[BinaryIO] = None,
+                          statistics: Optional[Dict] = None) -> BinaryIO:
     """
     Generate comprehensive Excel report for an experiment
     
     Args:
         experiment: Experiment model instance
+        output: Writable binary stream to render into (default: new in-memory buffer)
+        statistics: Already decoded experiment statistics (default: decoded from the experiment)
     
     Returns:
-        io.BytesIO: Excel file buffer
+        BinaryIO: Excel file stream, rewound to the start
     """
     
-    buffer = io.BytesIO()
+    buffer = output if output is not None else io.BytesIO()
+    
+    tp, fp, tn, fn = experiment.true_positive, experiment.false_positive, experiment.true_negative, experiment.false_negative
+    total_samples = tp + fp + tn + fn
+    
+    stats = statistics if statistics is not None else experiment.get_statistics()
+    cost_data = get_technique_costs(experiment.technique)
+    
+    # Summary Sheet
+    summary_rows = zip(_SUMMARY_LABELS, (
+        experiment.name,
+        experiment.technique,
+        experiment.created_at.strftime('%Y-%m-%d %H:%M'),
+        experiment.description or 'N/A',
+        tp,
+        fp,
+        tn,
+        fn,
+        total_samples
+    ))
+    
+    # Statistics Sheet
+    stats_rows = [
+        (label, stats[key]['value'], stats[key]['percentage'], stats[key]['ci_lower'], stats[key]['ci_upper'])
+        for label, key in _STATS_INTERVAL_METRICS
+    ]
+    stats_rows += [
+        ('F1 Score', stats['f1_score'], stats['f1_score'] * 100, None, None),
+        ('Matthews Correlation Coefficient', stats['mcc'], stats['mcc'] * 100, None, None),
+        ('Prevalence', stats['prevalence']['value'], stats['prevalence']['percentage'], None, None)
+    ]
     
-    with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
-        
-        # Summary Sheet
-        summary_data = {
-            'Experiment Information': [
-                'Name', 'Technique', 'Date Created', 'Description',
-                'True Positives', 'False Positives', 'True Negatives', 'False Negatives',
-                'Total Samples'
-            ],
-            'Values': [
-                experiment.name,
-                experiment.technique,
-                experiment.created_at.strftime('%Y-%m-%d %H:%M'),
-                experiment.description or 'N/A',
-                experiment.true_positive,
-                experiment.false_positive,
-                experiment.true_negative,
-                experiment.false_negative,
-                experiment.true_positive + experiment.false_positive + experiment.true_negative + experiment.false_negative
-            ]
-        }
-        
-        summary_df = pd.DataFrame(summary_data)
-        summary_df.to_excel(writer, sheet_name='Summary', index=False)
-        
-        # Statistics Sheet
-        stats = experiment.get_statistics()
-        
-        stats_data = {
-            'Metric': [
-                'Sensitivity', 'Specificity', 'Positive Predictive Value',
-                'Negative Predictive Value', 'Accuracy', 'F1 Score',
-                'Matthews Correlation Coefficient', 'Prevalence'
-            ],
-            'Value': [
-                stats['sensitivity']['value'],
-                stats['specificity']['value'],
-                stats['ppv']['value'],
-                stats['npv']['value'],
-                stats['accuracy']['value'],
-                stats['f1_score'],
-                stats['mcc'],
-                stats['prevalence']['value']
-            ],
-            'Percentage': [
-                stats['sensitivity']['percentage'],
-                stats['specificity']['percentage'],
-                stats['ppv']['percentage'],
-                stats['npv']['percentage'],
-                stats['accuracy']['percentage'],
-                stats['f1_score'] * 100,
-                stats['mcc'] * 100,
-                stats['prevalence']['percentage']
-            ],
-            'CI_Lower': [
-                stats['sensitivity']['ci_lower'],
-                stats['specificity']['ci_lower'],
-                stats['ppv']['ci_lower'],
-                stats['npv']['ci_lower'],
-                stats['accuracy']['ci_lower'],
-                None, None, None
-            ],
-            'CI_Upper': [
-                stats['sensitivity']['ci_upper'],
-                stats['specificity']['ci_upper'],
-                stats['ppv']['ci_upper'],
-                stats['npv']['ci_upper'],
-                stats['accuracy']['ci_upper'],
-                None, None, None
-            ]
-        }
-        
-        stats_df = pd.DataFrame(stats_data)
-        stats_df.to_excel(writer, sheet_name='Statistics', index=False)
-        
-        # Cost Analysis Sheet
-        cost_data = get_technique_costs(experiment.technique)
-        total_samples = experiment.true_positive + experiment.false_positive + experiment.true_negative + experiment.false_negative
-        
-        cost_analysis_data = {
-            'Cost Component': [
-                'Equipment Cost', 'Equipment Cost Range (Min)', 'Equipment Cost Range (Max)',
-                'Reagent Cost per Test', 'Reagent Cost Range (Min)', 'Reagent Cost Range (Max)',
-                'Total Samples', 'Total Reagent Cost', 'Maintenance Cost (Annual)',
-                'Power Consumption (Watts)', 'Estimated Total Cost', 'Cost per Sample'
-            ],
-            'Value': [
-                cost_data['equipment_cost'],
-                cost_data['equipment_cost_range'][0],
-                cost_data['equipment_cost_range'][1],
-                cost_data['reagent_cost_per_test'],
-                cost_data['reagent_cost_range'][0],
-                cost_data['reagent_cost_range'][1],
-                total_samples,
-                experiment.reagent_cost * total_samples,
-                cost_data['maintenance_cost_annual'],
-                cost_data['power_consumption_watts'],
-                experiment.total_cost,
-                experiment.total_cost / total_samples if total_samples > 0 else 0
-            ]
-        }
-        
-        cost_df = pd.DataFrame(cost_analysis_data)
-        cost_df.to_excel(writer, sheet_name='Cost Analysis', index=False)
-        
-        # Performance Characteristics Sheet
-        performance_data = {
-            'Characteristic': [
-                'Temperature Requirement', 'Time per Test (minutes)',
-                'Throughput per Hour', 'Power Consumption (watts)',
-                'Operator Skill Required', 'Field Suitability',
-                'Multiplexing Capability'
-            ],
-            'Value': [
-                cost_data['temperature_requirement'],
-                cost_data['time_per_test_minutes'],
-                cost_data['throughput_samples_per_hour'],
-                cost_data['power_consumption_watts'],
-                cost_data['operator_skill_required'],
-                cost_data['field_suitability'],
-                cost_data['multiplexing_capability']
-            ]
-        }
-        
-        performance_df = pd.DataFrame(performance_data)
-        performance_df.to_excel(writer, sheet_name='Performance', index=False)
-        
-        # Raw Data Sheet
-        raw_data = {
-            'Classification': ['True Positive', 'False Positive', 'True Negative', 'False Negative'],
-            'Count': [experiment.true_positive, experiment.false_positive, experiment.true_negative, experiment.false_negative],
-            'Percentage': [
-                (experiment.true_positive / total_samples * 100) if total_samples > 0 else 0,
-                (experiment.false_positive / total_samples * 100) if total_samples > 0 else 0,
-                (experiment.true_negative / total_samples * 100) if total_samples > 0 else 0,
-                (experiment.false_negative / total_samples * 100) if total_samples > 0 else 0
-            ]
-        }
-        
-        raw_df = pd.DataFrame(raw_data)
-        raw_df.to_excel(writer, sheet_name='Raw Data', index=False)
+    # Cost Analysis Sheet
+    cost_rows = zip(_COST_LABELS, (
+        cost_data['equipment_cost'],
+        cost_data['equipment_cost_range'][0],
+        cost_data['equipment_cost_range'][1],
+        cost_data['reagent_cost_per_test'],
+        cost_data['reagent_cost_range'][0],
+        cost_data['reagent_cost_range'][1],
+        total_samples,
+        experiment.reagent_cost * total_samples,
+        cost_data['maintenance_cost_annual'],
+        cost_data['power_consumption_watts'],
+        experiment.total_cost,
+        experiment.total_cost / total_samples if total_samples > 0 else 0
+    ))
+    
+    # Performance Characteristics Sheet
+    performance_rows = ((label, cost_data[key]) for label, key in _PERFORMANCE_FIELDS)
+    
+    # Raw Data Sheet
+    counts = np.array([tp, fp, tn, fn], dtype=np.int64)
+    percentages = counts / total_samples * 100 if total_samples > 0 else np.zeros(len(counts))
+    raw_rows = zip(_RAW_LABELS, counts.tolist(), percentages.tolist())
+    
+    _write_workbook(buffer, (
+        ('Summary', _SUMMARY_HEADER, summary_rows),
+        ('Statistics', _STATS_HEADER, stats_rows),
+        ('Cost Analysis', _COST_HEADER, cost_rows),
+        ('Performance', _PERFORMANCE_HEADER, performance_rows),
+        ('Raw Data', _RAW_HEADER, raw_rows)
+    ))
     
     buffer.seek(0)
     return buffer
 
+def _write_workbook(buffer: BinaryIO, sheets: Iterable[Tuple[str, Sequence[str], Iterable[Sequence]]]) -> None:
+    """
+    Stream sheets of rows into an xlsx workbook, one row at a time
+    
+    Args:
+        buffer: Writable binary stream receiving the workbook
+        sheets: (sheet name, header, rows) triples, written in order
+    """
+    
+    if xlsxwriter is not None:
+        # Rows are written strictly top to bottom, so constant_memory can
+        # flush each one as soon as the next starts
+        workbook = xlsxwriter.Workbook(buffer, {'constant_memory': True, 'strings_to_numbers': False})
+        header_format = workbook.add_format({'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'})
+        for name, header, rows in sheets:
+            worksheet = workbook.add_worksheet(name)
+            worksheet.write_row(0, 0, header, header_format)
+            for row_index, row in enumerate(rows, 1):
+                worksheet.write_row(row_index, 0, row)
+        workbook.close()
+        return
+    
+    workbook = _OpenpyxlWorkbook(write_only=True)
+    header_font = Font(bold=True)
+    for name, header, rows in sheets:
+        worksheet = workbook.create_sheet(name)
+        header_cells = []
+        for title in header:
+            cell = WriteOnlyCell(worksheet, value=title)
+            cell.font = header_font
+            header_cells.append(cell)
+        worksheet.append(header_cells)
+        for row in rows:
+            worksheet.append(row)
+    workbook.save(buffer)
+
 def create_statistics_chart(experiment: Experiment) -> str:
     """
     Create a statistics visualization chart and return as base64 string
@@ -371,13 +386,29 @@ def create_statistics_chart(experiment: Experiment) -> str:
         str: Base64 encoded image
     """
     
+    return _to_base64(render_statistics_chart(experiment))
+
+def render_statistics_chart(experiment: Experiment) -> io.BytesIO:
+    """
+    Create a statistics visualization chart as a PNG stream
+    
+    Unlike create_statistics_chart, the PNG is not base64 encoded, so it can
+    be handed straight to reportlab's Image or send_file.
+    
+    Args:
+        experiment: Experiment model instance
+    
+    Returns:
+        io.BytesIO: PNG image stream, rewound to the start
+    """
+    
     stats = experiment.get_statistics()
     
-    # Create figure
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5))
+    # Start from a copy of the pre-rendered axes, labels and gridlines
+    image = _statistics_chart_base().copy()
+    draw = ImageDraw.Draw(image)
     
     # Performance metrics bar chart
-    metrics = ['Sensitivity', 'Specificity', 'PPV', 'NPV', 'Accuracy']
     values = [
         stats['sensitivity']['percentage'],
         stats['specificity']['percentage'],
@@ -386,99 +417,218 @@ def create_statistics_chart(experiment: Experiment) -> str:
         stats['accuracy']['percentage']
     ]
     
-    colors_list = ['#3498db', '#2ecc71', '#e74c3c', '#f39c12', '#9b59b6']
-    
-    bars = ax1.bar(metrics, values, color=colors_list)
-    ax1.set_ylabel('Percentage (%)')
-    ax1.set_title(f'Diagnostic Performance - {experiment.technique}')
-    ax1.set_ylim(0, 100)
-    
-    # Add value labels on bars
-    for bar, value in zip(bars, values):
-        height = bar.get_height()
-        ax1.text(bar.get_x() + bar.get_width()/2., height + 1,
-                f'{value:.1f}%', ha='center', va='bottom')
+    left, top, right, _ = _STATS_BAR_BOX
+    _draw_text(draw, ((left + right) / 2, top - 35), f'Diagnostic Performance - {experiment.technique}', _CHART_TITLE_FONT)
+    _draw_bars(draw, _STATS_BAR_BOX, values, _STATS_COLORS, 100, '{:.1f}%')
     
     # Confusion matrix heatmap
-    confusion_matrix = [
+    confusion_matrix = np.array([
         [experiment.true_positive, experiment.false_negative],
         [experiment.false_positive, experiment.true_negative]
-    ]
+    ], dtype=np.int64)
     
-    im = ax2.imshow(confusion_matrix, cmap='Blues', interpolation='nearest')
-    ax2.set_title('Confusion Matrix')
-    ax2.set_xlabel('Predicted')
-    ax2.set_ylabel('Actual')
+    left, top = _HEATMAP_ORIGIN
+    cell = _HEATMAP_CELL
+    # Cell colours for the whole matrix come from one vectorized colormap
+    # lookup, then each cell is filled and annotated in a single pass
+    fills = _blues(confusion_matrix / (confusion_matrix.max() or 1)).tolist()
     
-    # Add text annotations
-    for i in range(2):
-        for j in range(2):
-            text = ax2.text(j, i, confusion_matrix[i][j],
-                           ha="center", va="center", color="black", fontweight='bold')
+    for (i, j), count in np.ndenumerate(confusion_matrix):
+        x0, y0 = left + j * cell, top + i * cell
+        draw.rectangle((x0, y0, x0 + cell, y0 + cell), fill=tuple(fills[i][j]))
+        _draw_text(draw, (x0 + cell / 2, y0 + cell / 2), str(count), _CHART_TITLE_FONT)
     
-    ax2.set_xticks([0, 1])
-    ax2.set_yticks([0, 1])
-    ax2.set_xticklabels(['Positive', 'Negative'])
-    ax2.set_yticklabels(['Positive', 'Negative'])
-    
-    plt.tight_layout()
+    return _encode_png(image)
+
+_COST_CHART_DTYPE = np.dtype([
+    ('tp', np.int64), ('fp', np.int64), ('tn', np.int64), ('fn', np.int64), ('total_cost', np.float64)
+])
+
+def create_cost_comparison_chart(experiments: list) -> str:
+    """
+    Create cost comparison chart for multiple experiments
     
-    # Convert to base64
-    buffer = io.BytesIO()
-    plt.savefig(buffer, format='png', dpi=150, bbox_inches='tight')
-    buffer.seek(0)
+    Args:
+        experiments: List of Experiment model instances
     
-    image_base64 = base64.b64encode(buffer.getvalue()).decode()
-    plt.close()
+    Returns:
+        str: Base64 encoded image, or an empty string when there are no experiments
+    """
     
-    return image_base64
+    png = render_cost_comparison_chart(experiments)
+    return _to_base64(png) if png is not None else ""
 
-def create_cost_comparison_chart(experiments: list) -> str:
+def render_cost_comparison_chart(experiments: list) -> Optional[io.BytesIO]:
     """
-    Create cost comparison chart for multiple experiments
+    Create cost comparison chart for multiple experiments as a PNG stream
     
     Args:
         experiments: List of Experiment model instances
     
     Returns:
-        str: Base64 encoded image
+        Optional[io.BytesIO]: PNG image stream, rewound to the start, or None
+        when there are no experiments
     """
     
     if not experiments:
-        return ""
+        return None
     
     # Prepare data
     techniques = [exp.technique for exp in experiments]
-    costs_per_sample = [
-        exp.total_cost / (exp.true_positive + exp.false_positive + exp.true_negative + exp.false_negative)
-        for exp in experiments
-    ]
+    # One pass over the experiments fills every numeric column at once
+    data = np.fromiter(
+        ((exp.true_positive, exp.false_positive, exp.true_negative, exp.false_negative, exp.total_cost)
+         for exp in experiments),
+        dtype=_COST_CHART_DTYPE, count=len(experiments)
+    )
+    totals = data['tp'] + data['fp'] + data['tn'] + data['fn']
+    costs_per_sample = (data['total_cost'] / totals).tolist()
     
-    # Create figure
-    fig, ax = plt.subplots(figsize=(10, 6))
+    image = PILImage.new('RGB', (1000, 600), 'white')
+    draw = ImageDraw.Draw(image)
     
-    # Create bar chart
-    bars = ax.bar(techniques, costs_per_sample, 
-                  color=['#3498db', '#2ecc71', '#e74c3c', '#f39c12'][:len(techniques)])
+    palette = ['#3498db', '#2ecc71', '#e74c3c', '#f39c12']
+    box = (100, 70, 960, 520)
+    y_max = (max(costs_per_sample) * 1.1) or 1
     
-    ax.set_ylabel('Cost per Sample ($)')
-    ax.set_title('Cost Comparison by Technique')
+    # Axes depend on the data here, so unlike the statistics chart there is
+    # no reusable base image
+    _draw_text(draw, ((box[0] + box[2]) / 2, box[1] - 35), 'Cost Comparison by Technique', _CHART_TITLE_FONT)
+    _draw_bar_axes(draw, box, techniques, y_max, 'Cost per Sample ($)')
+    _draw_bars(draw, box, costs_per_sample,
+               [palette[i % len(palette)] for i in range(len(techniques))], y_max, '${:.2f}')
     
-    # Add value labels on bars
-    for bar, cost in zip(bars, costs_per_sample):
-        height = bar.get_height()
-        ax.text(bar.get_x() + bar.get_width()/2., height + height*0.01,
-                f'${cost:.2f}', ha='center', va='bottom')
+    return _encode_png(image)
+
+def _load_font(size: int) -> ImageFont.ImageFont:
+    """Load Pillow's bundled scalable font, falling back to the fixed bitmap font"""
+    try:
+        return ImageFont.load_default(size=size)
+    except TypeError:  # Pillow < 10.1 has no sized default font
+        return ImageFont.load_default()
+
+_CHART_FONT = _load_font(14)
+_CHART_TITLE_FONT = _load_font(18)
+
+# Fixed layout of the statistics chart: bar plot on the left, heatmap on the right
+_STATS_BAR_BOX = (80, 60, 640, 440)
+_STATS_METRICS = ['Sensitivity', 'Specificity', 'PPV', 'NPV', 'Accuracy']
+_STATS_COLORS = ['#3498db', '#2ecc71', '#e74c3c', '#f39c12', '#9b59b6']
+_HEATMAP_ORIGIN = (820, 80)
+_HEATMAP_CELL = 170
+
+@functools.lru_cache(maxsize=1)
+def _statistics_chart_base() -> PILImage.Image:
+    """
+    Render the data-independent parts of the statistics chart once
     
-    plt.xticks(rotation=45)
-    plt.tight_layout()
+    Callers must draw on a copy; the cached image itself is never modified,
+    so concurrent reports can share it without locking.
+    """
     
-    # Convert to base64
-    buffer = io.BytesIO()
-    plt.savefig(buffer, format='png', dpi=150, bbox_inches='tight')
-    buffer.seek(0)
+    image = PILImage.new('RGB', (1200, 500), 'white')
+    draw = ImageDraw.Draw(image)
+    
+    _draw_bar_axes(draw, _STATS_BAR_BOX, _STATS_METRICS, 100, 'Percentage (%)')
+    
+    left, top = _HEATMAP_ORIGIN
+    cell = _HEATMAP_CELL
+    _draw_text(draw, (left + cell, 40), 'Confusion Matrix', _CHART_TITLE_FONT)
+    for k, label in enumerate(['Positive', 'Negative']):
+        _draw_text(draw, (left + k * cell + cell / 2, top + 2 * cell + 15), label, _CHART_FONT)
+        _draw_text(draw, (left - 40, top + k * cell + cell / 2), label, _CHART_FONT)
+    _draw_text(draw, (left + cell, top + 2 * cell + 45), 'Predicted', _CHART_FONT)
+    _draw_text(draw, (left - 40, top - 20), 'Actual', _CHART_FONT)
+    
+    return image
+
+def _draw_text(draw: ImageDraw.ImageDraw, center, text: str, font, fill='black'):
+    """Draw text centered on a point"""
+    left, top, right, bottom = draw.textbbox((0, 0), text, font=font)
+    draw.text((center[0] - (left + right) / 2, center[1] - (top + bottom) / 2), text, fill=fill, font=font)
+
+def _draw_bar_axes(draw: ImageDraw.ImageDraw, box, labels, y_max: float, ylabel: str):
+    """
+    Draw the axes, gridlines, tick labels and category labels of a bar chart
     
-    image_base64 = base64.b64encode(buffer.getvalue()).decode()
-    plt.close()
+    Args:
+        draw: Drawing context of the target image
+        box: (left, top, right, bottom) pixel bounds of the plot area
+        labels: Category label per bar
+        y_max: Data value at the top of the plot area
+        ylabel: Y-axis caption
+    """
+    
+    left, top, right, bottom = box
+    height = bottom - top
+    
+    _draw_text(draw, (left, top - 12), ylabel, _CHART_FONT)
     
-    return image_base64
+    # Y axis ticks and light gridlines
+    for k in range(6):
+        tick_value = y_max * k / 5
+        y = bottom - height * k / 5
+        draw.line((left, y, right, y), fill='#e5e5e5')
+        label = f'{tick_value:.0f}' if y_max >= 10 else f'{tick_value:.2f}'
+        label_width = draw.textbbox((0, 0), label, font=_CHART_FONT)[2]
+        _draw_text(draw, (left - 10 - label_width / 2, y), label, _CHART_FONT)
+    
+    slot = (right - left) / max(len(labels), 1)
+    for k, label in enumerate(labels):
+        _draw_text(draw, (left + slot * (k + 0.5), bottom + 15), label, _CHART_FONT)
+    
+    draw.line((left, top, left, bottom), fill='black', width=2)
+    draw.line((left, bottom, right, bottom), fill='black', width=2)
+
+def _draw_bars(draw: ImageDraw.ImageDraw, box, values, bar_colors, y_max: float, value_format: str):
+    """
+    Draw the bars of a bar chart, each with its value printed above it
+    
+    Args:
+        draw: Drawing context of the target image
+        box: (left, top, right, bottom) pixel bounds of the plot area
+        values: Bar heights in data units
+        bar_colors: Fill color per bar
+        y_max: Data value at the top of the plot area
+        value_format: Format string for the value printed above each bar
+    """
+    
+    left, top, right, bottom = box
+    height = bottom - top
+    slot = (right - left) / max(len(values), 1)
+    
+    for k, (value, color) in enumerate(zip(values, bar_colors)):
+        x0 = left + slot * k + slot * 0.1
+        x1 = left + slot * (k + 1) - slot * 0.1
+        bar_top = bottom - height * min(max(value / y_max, 0), 1)
+        # Stop just above the x axis so the bar does not paint over it
+        draw.rectangle((x0, bar_top, x1, bottom - 2), fill=color)
+        _draw_text(draw, ((x0 + x1) / 2, bar_top - 12), value_format.format(value), _CHART_FONT)
+
+_BLUES_LIGHT = np.array([247, 251, 255], dtype=np.float64)
+_BLUES_DARK = np.array([8, 48, 107], dtype=np.float64)
+
+def _blues(fractions: np.ndarray) -> np.ndarray:
+    """
+    Interpolate from light to dark blue, like matplotlib's 'Blues' colormap
+    
+    Args:
+        fractions: Array of positions in [0, 1]
+    
+    Returns:
+        np.ndarray: Integer RGB triples, with a trailing axis of length 3
+    """
+    fractions = np.asarray(fractions, dtype=np.float64)[..., np.newaxis]
+    return np.rint(_BLUES_LIGHT + (_BLUES_DARK - _BLUES_LIGHT) * fractions).astype(np.int64)
+
+def _to_base64(png: io.BytesIO) -> str:
+    """Base64 encode a PNG stream straight from its buffer, without copying it out first"""
+    with png.getbuffer() as data:
+        return base64.b64encode(data).decode()
+
+def _encode_png(image: PILImage.Image) -> io.BytesIO:
+    """Serialize an image to an in-memory PNG stream, rewound to the start"""
+    buffer = io.BytesIO()
+    image.save(buffer, format='PNG')
+    buffer.seek(0)
+    return buffer
@@ -1,12 +1,44 @@
+import functools
 import numpy as np
 from scipy import stats
-from sklearn.metrics import cohen_kappa_score
 import math
 
+try:
+    from numba import njit
+except ImportError:  # Numba is optional; kernels run as plain Python without it
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+# Two-sided standard normal critical values for the usual confidence levels,
+# so the common case skips the scipy norm.ppf call entirely
+_Z_TABLE = {
+    0.90: 1.6448536269514722,
+    0.95: 1.959963984540054,
+    0.99: 2.5758293035489004,
+}
+
+@functools.lru_cache(maxsize=8)
+def _z_critical(confidence):
+    """
+    Two-sided standard normal critical value for a confidence level
+    
+    Memoized, so even uncommon confidence levels pay for the scipy call
+    only once per process.
+    """
+    z = _Z_TABLE.get(confidence)
+    if z is None:
+        z = stats.norm.ppf((1 + confidence) / 2)
+    return z
+
 def calculate_diagnostic_stats(tp, fp, tn, fn, confidence=0.95):
     """
     Calculate diagnostic statistics from confusion matrix values
     
+    The metrics are memoized per (tp, fp, tn, fn, confidence), but every call
+    gets a freshly built dict that the caller is free to modify.
+    
     Args:
         tp: True Positives
         fp: False Positives  
@@ -18,6 +50,12 @@ def calculate_diagnostic_stats(tp, fp, tn, fn, confidence=0.95):
         dict: Dictionary containing all diagnostic statistics
     """
     
+    return _stats_dict(*_diagnostic_stats_fields(tp, fp, tn, fn, confidence))
+
+@functools.lru_cache(maxsize=1024)
+def _diagnostic_stats_fields(tp, fp, tn, fn, confidence):
+    """Compute the _stats_dict arguments for one confusion matrix, as an immutable tuple"""
+    
     # Basic validation
     if tp + fp + tn + fn == 0:
         raise ValueError("All confusion matrix values cannot be zero")
@@ -64,26 +102,13 @@ def calculate_diagnostic_stats(tp, fp, tn, fn, confidence=0.95):
     mcc_denominator = math.sqrt((tp + fp) * (tp + fn) * (tn + fp) * (tn + fn))
     mcc = mcc_numerator / mcc_denominator if mcc_denominator > 0 else 0
     
-    # Calculate confidence intervals using Wilson score interval
-    def wilson_ci(x, n, conf_level=confidence):
-        """Calculate Wilson score confidence interval"""
-        if n == 0:
-            return (0, 0)
-        
-        z = stats.norm.ppf((1 + conf_level) / 2)
-        p = x / n
-        
-        center = (p + z*z/(2*n)) / (1 + z*z/n)
-        margin = z * math.sqrt((p*(1-p) + z*z/(4*n)) / n) / (1 + z*z/n)
-        
-        return (max(0, center - margin), min(1, center + margin))
-    
-    # Calculate confidence intervals
-    sensitivity_ci = wilson_ci(tp, tp + fn)
-    specificity_ci = wilson_ci(tn, tn + fp)
-    ppv_ci = wilson_ci(tp, tp + fp)
-    npv_ci = wilson_ci(tn, tn + fn)
-    accuracy_ci = wilson_ci(tp + tn, total)
+    # Calculate Wilson score confidence intervals for sensitivity, specificity,
+    # PPV, NPV and accuracy in one vectorized pass with a single critical value
+    ci_lower, ci_upper = _wilson_ci_arrays(
+        np.array([tp, tn, tp, tn, tp + tn], dtype=np.float64),
+        np.array([tp + fn, tn + fp, tp + fp, tn + fn, total], dtype=np.float64),
+        _z_critical(confidence)
+    )
     
     # Calculate Cohen's Kappa for self-consistency (simulation)
     # For individual experiments, we calculate kappa as agreement between expected and observed
@@ -102,55 +127,52 @@ def calculate_diagnostic_stats(tp, fp, tn, fn, confidence=0.95):
             
             # Simple approximation for kappa confidence interval
             se_kappa = math.sqrt(expected_agreement / (total_samples * (1 - expected_agreement)**2)) if expected_agreement < 1.0 else 0
-            z_critical = stats.norm.ppf((1 + confidence) / 2)
+            z_critical = _z_critical(confidence)
             kappa_ci = (
                 max(-1.0, kappa_value - z_critical * se_kappa),
                 min(1.0, kappa_value + z_critical * se_kappa)
             )
             
-            # Interpretation based on Altman scale
-            if kappa_value < 0.20:
-                kappa_interpretation = "Poor agreement"
-            elif kappa_value < 0.40:
-                kappa_interpretation = "Fair agreement"
-            elif kappa_value < 0.60:
-                kappa_interpretation = "Moderate agreement"
-            elif kappa_value < 0.80:
-                kappa_interpretation = "Good agreement"
-            else:
-                kappa_interpretation = "Very good agreement"
+            kappa_interpretation = _interpret_kappa(kappa_value)
 
-    return {
-        'sensitivity': {
-            'value': sensitivity,
-            'percentage': sensitivity * 100,
-            'ci_lower': sensitivity_ci[0],
-            'ci_upper': sensitivity_ci[1]
-        },
-        'specificity': {
-            'value': specificity,
-            'percentage': specificity * 100,
-            'ci_lower': specificity_ci[0],
-            'ci_upper': specificity_ci[1]
-        },
-        'ppv': {
-            'value': ppv,
-            'percentage': ppv * 100,
-            'ci_lower': ppv_ci[0],
-            'ci_upper': ppv_ci[1]
-        },
-        'npv': {
-            'value': npv,
-            'percentage': npv * 100,
-            'ci_lower': npv_ci[0],
-            'ci_upper': npv_ci[1]
-        },
-        'accuracy': {
-            'value': accuracy,
-            'percentage': accuracy * 100,
-            'ci_lower': accuracy_ci[0],
-            'ci_upper': accuracy_ci[1]
-        },
+    return (
+        (sensitivity, specificity, ppv, npv, accuracy), tuple(ci_lower.tolist()), tuple(ci_upper.tolist()),
+        prevalence, f1_score, mcc, lr_positive, lr_negative, dor,
+        kappa_value, kappa_ci, kappa_interpretation, total, confidence
+    )
+
+# Metrics reported with a Wilson interval, in output order
+_INTERVAL_METRICS = ('sensitivity', 'specificity', 'ppv', 'npv', 'accuracy')
+
+def _stats_dict(rates, ci_lower, ci_upper, prevalence, f1_score, mcc, lr_positive, lr_negative, dor,
+                kappa_value, kappa_ci, kappa_interpretation, sample_size, confidence):
+    """
+    Assemble one experiment's statistics dictionary
+    
+    Shared by calculate_diagnostic_stats and calculate_diagnostic_stats_batch
+    so both produce the same layout.
+    
+    Args:
+        rates: Sensitivity, specificity, PPV, NPV and accuracy
+        ci_lower: Wilson lower bounds, in the same order as rates
+        ci_upper: Wilson upper bounds, in the same order as rates
+        kappa_ci: (lower, upper) bounds of Cohen's Kappa
+        sample_size: Total number of samples
+    
+    Returns:
+        dict: Dictionary containing all diagnostic statistics
+    """
+    
+    stats = {
+        metric: {
+            'value': value,
+            'percentage': value * 100,
+            'ci_lower': lower,
+            'ci_upper': upper
+        }
+        for metric, value, lower, upper in zip(_INTERVAL_METRICS, rates, ci_lower, ci_upper)
+    }
+    stats.update({
         'prevalence': {
             'value': prevalence,
             'percentage': prevalence * 100
@@ -168,84 +190,148 @@ def calculate_diagnostic_stats(tp, fp, tn, fn, confidence=0.95):
             'ci_upper': kappa_ci[1],
             'interpretation': kappa_interpretation
         },
-        'sample_size': total,
+        'sample_size': sample_size,
         'confidence_level': confidence
-    }
+    })
+    return stats
 
-def calculate_cohens_kappa(rater1, rater2, confidence=0.95):
-    """
-    Calculate Cohen's Kappa with confidence intervals using GraphPad/Fleiss methodology
+def _safe_divide(numerator, denominator, fill):
+    """Element-wise division that yields `fill` wherever the denominator is not positive"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(denominator > 0, numerator / np.where(denominator > 0, denominator, 1), fill)
+
+def _wilson_ci_arrays(x, n, z):
+    """Vectorized Wilson score interval; rows with n == 0 get (0, 0)"""
+    safe_n = np.where(n > 0, n, 1)
+    p = x / safe_n
     
-    Args:
-        rater1: Array of ratings from first rater/method
-        rater2: Array of ratings from second rater/method
-        confidence: Confidence level (default 0.95 for 95% CI)
+    center = (p + z*z/(2*safe_n)) / (1 + z*z/safe_n)
+    margin = z * np.sqrt((p*(1-p) + z*z/(4*safe_n)) / safe_n) / (1 + z*z/safe_n)
     
-    Returns:
-        dict: Kappa value, confidence interval, and interpretation
+    lower = np.where(n > 0, np.maximum(0, center - margin), 0)
+    upper = np.where(n > 0, np.minimum(1, center + margin), 0)
+    return lower, upper
+
+def calculate_diagnostic_stats_batch(tp, fp, tn, fn, confidence=0.95):
     """
+    Calculate diagnostic statistics for many confusion matrices at once
     
-    if len(rater1) != len(rater2):
-        raise ValueError("Rater arrays must have the same length")
-    
-    if len(rater1) == 0:
-        raise ValueError("Rater arrays cannot be empty")
-    
-    # Convert to numpy arrays
-    rater1 = np.array(rater1)
-    rater2 = np.array(rater2)
+    Produces the same per-experiment dictionaries as calculate_diagnostic_stats,
+    but evaluates every metric as a single NumPy expression over all rows.
     
-    # Calculate Cohen's Kappa using sklearn
-    kappa = cohen_kappa_score(rater1, rater2)
-    
-    # Calculate standard error using Fleiss methodology
-    n = len(rater1)
-    
-    # Create contingency table
-    categories = np.unique(np.concatenate([rater1, rater2]))
-    k = len(categories)
+    Args:
+        tp: Sequence of True Positives
+        fp: Sequence of False Positives
+        tn: Sequence of True Negatives
+        fn: Sequence of False Negatives
+        confidence: Confidence level for intervals (default 0.95)
     
-    # Build contingency matrix
-    contingency = np.zeros((k, k))
-    for i, cat1 in enumerate(categories):
-        for j, cat2 in enumerate(categories):
-            contingency[i, j] = np.sum((rater1 == cat1) & (rater2 == cat2))
+    Returns:
+        list: One statistics dictionary per confusion matrix
+    """
     
-    # Calculate marginal probabilities
-    p_obs = np.trace(contingency) / n  # Observed agreement
+    tp = np.asarray(tp, dtype=np.float64)
+    fp = np.asarray(fp, dtype=np.float64)
+    tn = np.asarray(tn, dtype=np.float64)
+    fn = np.asarray(fn, dtype=np.float64)
     
-    row_marginals = np.sum(contingency, axis=1) / n
-    col_marginals = np.sum(contingency, axis=0) / n
-    p_exp = np.sum(row_marginals * col_marginals)  # Expected agreement
+    total = tp + fp + tn + fn
+    if np.any(total == 0):
+        raise ValueError("All confusion matrix values cannot be zero")
     
+    sensitivity = _safe_divide(tp, tp + fn, 0.0)
+    specificity = _safe_divide(tn, tn + fp, 0.0)
+    ppv = _safe_divide(tp, tp + fp, 0.0)
+    npv = _safe_divide(tn, tn + fn, 0.0)
+    accuracy = (tp + tn) / total
+    prevalence = (tp + fn) / total
+    fpr = _safe_divide(fp, fp + tn, 0.0)
+    fnr = _safe_divide(fn, fn + tp, 0.0)
+    
+    lr_positive = _safe_divide(sensitivity, fpr, np.inf)
+    lr_negative = _safe_divide(fnr, specificity, np.inf)
+    with np.errstate(invalid='ignore'):
+        dor = _safe_divide(lr_positive, lr_negative, np.inf)
+    
+    f1_score = _safe_divide(2 * ppv * sensitivity, ppv + sensitivity, 0.0)
+    
+    mcc_denominator = np.sqrt((tp + fp) * (tp + fn) * (tn + fp) * (tn + fn))
+    mcc = _safe_divide(tp * tn - fp * fn, mcc_denominator, 0.0)
+    
+    # Wilson intervals for all five rates and all rows in one call, shaped (rows, 5)
+    z = _z_critical(confidence)
+    ci_lower, ci_upper = _wilson_ci_arrays(
+        np.stack([tp, tn, tp, tn, tp + tn], axis=1),
+        np.stack([tp + fn, tn + fp, tp + fp, tn + fn, total], axis=1),
+        z
+    )
+    rates = np.stack([sensitivity, specificity, ppv, npv, accuracy], axis=1)
+    
+    # Observed vs expected agreement as a proxy for Cohen's Kappa
+    observed_agreement = (tp + tn) / total
+    expected_agreement = ((tp + fn) * (tp + fp) + (tn + fp) * (tn + fn)) / (total * total)
+    kappa_defined = expected_agreement < 1.0
+    one_minus_expected = np.where(kappa_defined, 1 - expected_agreement, 1)
+    kappa_value = np.where(kappa_defined, (observed_agreement - expected_agreement) / one_minus_expected, 0.0)
+    se_kappa = np.sqrt(expected_agreement / (total * one_minus_expected**2))
+    kappa_lower = np.where(kappa_defined, np.maximum(-1.0, kappa_value - z * se_kappa), 0.0)
+    kappa_upper = np.where(kappa_defined, np.minimum(1.0, kappa_value + z * se_kappa), 0.0)
+    
+    # Convert to Python scalars column by column, then assemble each row
+    columns = zip(
+        rates.tolist(), ci_lower.tolist(), ci_upper.tolist(), prevalence.tolist(), f1_score.tolist(),
+        mcc.tolist(), lr_positive.tolist(), lr_negative.tolist(), dor.tolist(),
+        kappa_value.tolist(), kappa_lower.tolist(), kappa_upper.tolist(), kappa_defined.tolist(),
+        total.astype(np.int64).tolist()
+    )
+    return [
+        _stats_dict(
+            row_rates, row_lower, row_upper, row_prevalence, row_f1, row_mcc, row_lr_positive,
+            row_lr_negative, row_dor, row_kappa, (row_kappa_lower, row_kappa_upper),
+            _interpret_kappa(row_kappa) if row_kappa_defined else "Not calculated",
+            row_total, confidence
+        )
+        for (row_rates, row_lower, row_upper, row_prevalence, row_f1, row_mcc, row_lr_positive,
+             row_lr_negative, row_dor, row_kappa, row_kappa_lower, row_kappa_upper, row_kappa_defined,
+             row_total) in columns
+    ]
+
+def _interpret_kappa(k):
+    """Interpret a kappa value on the Altman scale"""
+    if k < 0.20:
+        return "Poor agreement"
+    elif k < 0.40:
+        return "Fair agreement"
+    elif k < 0.60:
+        return "Moderate agreement"
+    elif k < 0.80:
+        return "Good agreement"
+    else:
+        return "Very good agreement"
+
+@njit(cache=True)
+def _kappa_core(p_obs, p_exp, n, z_critical):
+    """Kappa, its Fleiss standard error and confidence bounds from agreement proportions"""
     # Standard error calculation (Fleiss method)
     # This is a simplified version - full Fleiss calculation is more complex
-    if p_exp == 1:
-        se_kappa = 0
+    if p_exp >= 1.0:
+        kappa = 0.0
+        se_kappa = 0.0
     else:
+        kappa = (p_obs - p_exp) / (1.0 - p_exp)
         # Simplified SE calculation
-        se_kappa = math.sqrt(p_exp / (n * (1 - p_exp)**2))
+        se_kappa = math.sqrt(p_exp / (n * (1.0 - p_exp)**2))
     
-    # Calculate confidence interval
-    z_critical = stats.norm.ppf((1 + confidence) / 2)
     ci_lower = kappa - z_critical * se_kappa
-    ci_upper = kappa + z_critical * se_kappa
-    
     # Cap upper CI at 1.0 (GraphPad methodology)
-    ci_upper = min(1.0, ci_upper)
-    
-    # Interpretation based on Altman scale
-    def interpret_kappa(k):
-        if k < 0.20:
-            return "Poor agreement"
-        elif k < 0.40:
-            return "Fair agreement"
-        elif k < 0.60:
-            return "Moderate agreement"
-        elif k < 0.80:
-            return "Good agreement"
-        else:
-            return "Very good agreement"
+    ci_upper = min(1.0, kappa + z_critical * se_kappa)
+    
+    return kappa, se_kappa, ci_lower, ci_upper
+
+def _kappa_result(p_obs, p_exp, n, confidence):
+    """Assemble the Cohen's Kappa result dictionary from agreement proportions"""
+    z_critical = _z_critical(confidence)
+    kappa, se_kappa, ci_lower, ci_upper = _kappa_core(float(p_obs), float(p_exp), float(n), float(z_critical))
     
     return {
         'kappa': kappa,
@@ -255,12 +341,140 @@ def calculate_cohens_kappa(rater1, rater2, confidence=0.95):
             'confidence_level': confidence
         },
         'standard_error': se_kappa,
-        'interpretation': interpret_kappa(kappa),
-        'sample_size': n,
-        'observed_agreement': p_obs,
-        'expected_agreement': p_exp
+        'interpretation': _interpret_kappa(kappa),
+        'sample_size': int(n),
+        'observed_agreement': float(p_obs),
+        'expected_agreement': float(p_exp)
     }
 
+def calculate_cohens_kappa_from_counts(a, b, c, d, confidence=0.95):
+    """
+    Calculate Cohen's Kappa for two binary raters directly from 2x2 cell counts
+    
+    Args:
+        a: Both raters positive
+        b: Rater 1 positive, rater 2 negative
+        c: Rater 1 negative, rater 2 positive
+        d: Both raters negative
+        confidence: Confidence level (default 0.95 for 95% CI)
+    
+    Returns:
+        dict: Kappa value, confidence interval, and interpretation
+    """
+    
+    if min(a, b, c, d) < 0:
+        raise ValueError("Cell counts must be non-negative")
+    
+    n = a + b + c + d
+    if n == 0:
+        raise ValueError("Cell counts cannot all be zero")
+    
+    p_obs = (a + d) / n
+    p_exp = ((a + b) * (a + c) + (c + d) * (b + d)) / (n * n)
+    
+    return _kappa_result(p_obs, p_exp, n, confidence)
+
+def calculate_pairwise_kappa_from_counts(counts, confidence=0.95):
+    """
+    Calculate Cohen's Kappa for every pair of experiments in one vectorized pass
+    
+    For each pair (i, j) with i < j, experiment i's confusion matrix is scaled
+    down to the smaller of the two sample sizes and its cells are used as the
+    2x2 agreement table, as in calculate_cohens_kappa_from_counts.
+    
+    Args:
+        counts: Array-like of shape (k, 4) holding TP, FP, FN, TN per experiment
+        confidence: Confidence level (default 0.95 for 95% CI)
+    
+    Returns:
+        list: (i, j, result) tuples in row-major pair order, where result has
+        the same layout as calculate_cohens_kappa_from_counts
+    """
+    
+    counts = np.asarray(counts, dtype=np.float64)
+    totals = counts.sum(axis=1)
+    
+    if np.any(totals == 0):
+        raise ValueError("Cell counts cannot all be zero")
+    
+    first, second = np.triu_indices(len(counts), 1)
+    min_total = np.minimum(totals[first], totals[second])
+    
+    # Scaled 2x2 cells (a, b, c, d) for every pair, truncated to whole samples
+    cells = np.floor(counts[first] / totals[first, None] * min_total[:, None])
+    a, b, c, d = cells.T
+    n = cells.sum(axis=1)
+    
+    if np.any(n == 0):
+        raise ValueError("Cell counts cannot all be zero")
+    
+    p_obs = (a + d) / n
+    p_exp = ((a + b) * (a + c) + (c + d) * (b + d)) / (n * n)
+    
+    # Same arithmetic as _kappa_core, evaluated for all pairs at once
+    defined = p_exp < 1.0
+    one_minus_exp = np.where(defined, 1.0 - p_exp, 1.0)
+    kappa = np.where(defined, (p_obs - p_exp) / one_minus_exp, 0.0)
+    se_kappa = np.where(defined, np.sqrt(p_exp / (n * one_minus_exp**2)), 0.0)
+    
+    z_critical = _z_critical(confidence)
+    ci_lower = kappa - z_critical * se_kappa
+    ci_upper = np.minimum(1.0, kappa + z_critical * se_kappa)
+    
+    results = []
+    for idx in range(len(first)):
+        results.append((int(first[idx]), int(second[idx]), {
+            'kappa': float(kappa[idx]),
+            'confidence_interval': {
+                'lower': float(ci_lower[idx]),
+                'upper': float(ci_upper[idx]),
+                'confidence_level': confidence
+            },
+            'standard_error': float(se_kappa[idx]),
+            'interpretation': _interpret_kappa(kappa[idx]),
+            'sample_size': int(n[idx]),
+            'observed_agreement': float(p_obs[idx]),
+            'expected_agreement': float(p_exp[idx])
+        }))
+    
+    return results
+
+def calculate_cohens_kappa(rater1, rater2, confidence=0.95):
+    """
+    Calculate Cohen's Kappa with confidence intervals using GraphPad/Fleiss methodology
+    
+    Args:
+        rater1: Array of ratings from first rater/method
+        rater2: Array of ratings from second rater/method
+        confidence: Confidence level (default 0.95 for 95% CI)
+    
+    Returns:
+        dict: Kappa value, confidence interval, and interpretation
+    """
+    
+    if len(rater1) != len(rater2):
+        raise ValueError("Rater arrays must have the same length")
+    
+    if len(rater1) == 0:
+        raise ValueError("Rater arrays cannot be empty")
+    
+    # Map both raters onto shared category indices
+    n = len(rater1)
+    categories, codes = np.unique(np.concatenate([np.asarray(rater1), np.asarray(rater2)]), return_inverse=True)
+    k = len(categories)
+    codes1, codes2 = codes[:n], codes[n:]
+    
+    # Kappa only needs the diagonal and the marginals of the contingency
+    # table, so both come straight from the label codes without building
+    # the k x k matrix
+    p_obs = np.count_nonzero(codes1 == codes2) / n  # Observed agreement
+    
+    row_marginals = np.bincount(codes1, minlength=k) / n
+    col_marginals = np.bincount(codes2, minlength=k) / n
+    p_exp = np.dot(row_marginals, col_marginals)  # Expected agreement
+    
+    return _kappa_result(p_obs, p_exp, n, confidence)
+
 def calculate_multiple_comparisons_correction(p_values, method='bonferroni'):
     """
     Apply multiple comparisons correction to p-values
@@ -273,39 +487,30 @@ def calculate_multiple_comparisons_correction(p_values, method='bonferroni'):
         dict: Corrected p-values and significance results
     """
     
-    p_array = np.array(p_values)
+    p_array = np.asarray(p_values, dtype=np.float64)
     n = len(p_array)
     
     if method == 'bonferroni':
         corrected = p_array * n
         corrected = np.minimum(corrected, 1.0)  # Cap at 1.0
-    elif method == 'holm':
-        # Holm-Bonferroni method
-        sorted_indices = np.argsort(p_array)
-        corrected = np.zeros_like(p_array)
-        
-        for i, idx in enumerate(sorted_indices):
-            corrected[idx] = min(1.0, p_array[idx] * (n - i))
-            
-        # Ensure monotonicity
-        sorted_corrected = corrected[sorted_indices]
-        for i in range(1, len(sorted_corrected)):
-            sorted_corrected[i] = max(sorted_corrected[i], sorted_corrected[i-1])
-        corrected[sorted_indices] = sorted_corrected
+    elif method in ('holm', 'fdr_bh'):
+        order = np.argsort(p_array)
+        sorted_p = p_array[order]
         
-    elif method == 'fdr_bh':
-        # Benjamini-Hochberg FDR correction
-        sorted_indices = np.argsort(p_array)
-        corrected = np.zeros_like(p_array)
+        if method == 'holm':
+            # Holm-Bonferroni: scale the i-th smallest p-value by (n - i), then
+            # enforce monotonicity with a running maximum
+            adjusted = np.maximum.accumulate(np.minimum(sorted_p * np.arange(n, 0, -1), 1.0))
+        else:
+            # Benjamini-Hochberg FDR: scale by n / rank, then enforce
+            # monotonicity with a running minimum taken from the largest p-value down
+            adjusted = np.minimum(sorted_p * n / np.arange(1, n + 1), 1.0)
+            adjusted = np.minimum.accumulate(adjusted[::-1])[::-1]
         
-        for i, idx in enumerate(sorted_indices):
-            corrected[idx] = min(1.0, p_array[idx] * n / (i + 1))
-            
-        # Ensure monotonicity (decreasing)
-        sorted_corrected = corrected[sorted_indices]
-        for i in range(len(sorted_corrected) - 2, -1, -1):
-            sorted_corrected[i] = min(sorted_corrected[i], sorted_corrected[i + 1])
-        corrected[sorted_indices] = sorted_corrected
+        corrected = np.empty_like(p_array)
+        corrected[order] = adjusted
+    else:
+        raise ValueError(f"Unknown correction method: {method}")
     
     return {
         'original_p_values': p_values,